@@ -0,0 +1,196 @@
+"""Информация о модуле.
+Нагрузочный тест бота на локальных имитаторах API.
+
+Запуск из корня репозитория:
+    python -m benchmarks.load_test --tokens 1000 --engine async
+"""
+import argparse
+import json
+import logging
+import random
+import re
+import resource
+import statistics
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+import telegram
+from telegram.utils.request import Request
+
+import homework
+from benchmarks.simulator import STATUSES, FakePracticumAPI, FakeTelegramAPI
+from client import PracticumClient
+from engine import AsyncPollingEngine
+from subscriptions import PollState, parse_subscriptions
+
+HOMEWORK_NAME = re.compile(r'"hw-(\S+)"')
+PATCHED_GLOBALS = (
+    "STATE_DB", "HEADERS", "TELEGRAM_CHAT_ID", "_store", "_breakers",
+    "_client",
+)
+
+
+def make_scripts(tokens: int, duration: float) -> Dict:
+    """Раскладывает смены статусов каждой работы по времени теста."""
+    return {
+        f"token{i}": list(
+            zip(
+                sorted(random.uniform(0, duration) for _ in STATUSES),
+                STATUSES,
+            )
+        )
+        for i in range(tokens)
+    }
+
+
+def notification_latencies(
+    practicum: FakePracticumAPI, telegram_api: FakeTelegramAPI
+) -> List[float]:
+    """Считает задержки от смены статуса до получения сообщения."""
+    latencies = []
+    for received_at, _, text in telegram_api.messages:
+        for token in HOMEWORK_NAME.findall(text):
+            changes = [
+                practicum.started + offset
+                for offset, _ in practicum.scripts.get(token, ())
+                if practicum.started + offset <= received_at
+            ]
+            if changes:
+                latencies.append(received_at - max(changes))
+    return latencies
+
+
+def percentile(values: List[float], share: float) -> float:
+    """Возвращает перцентиль выборки, 0 для пустой."""
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(len(values) * share), len(values) - 1)]
+
+
+def timed(call: Callable, samples: int) -> float:
+    """Возвращает медианное время вызова в миллисекундах."""
+    durations = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        try:
+            call()
+        except Exception:
+            pass
+        durations.append(time.perf_counter() - started)
+    return round(statistics.median(durations) * 1000, 3)
+
+
+def run(
+    tokens: int = 100,
+    rounds: int = 5,
+    interval: float = 1,
+    api_latency: float = 0.01,
+    api_error_rate: float = 0,
+    telegram_latency: float = 0.01,
+    engine: str = "async",
+    concurrency: int = 50,
+    samples: int = 20,
+) -> Dict:
+    """Информация о функции.
+    Прогоняет `rounds` раундов опроса через poll_all, затем замеряет
+    отдельные вызовы get_api_answer и send_message и возвращает метрики.
+    """
+    scripts = make_scripts(tokens, rounds * interval)
+    practicum = FakePracticumAPI(scripts, api_latency, api_error_rate)
+    telegram_api = FakeTelegramAPI(telegram_latency)
+    saved = {name: getattr(homework, name) for name in PATCHED_GLOBALS}
+    try:
+        with practicum, telegram_api, tempfile.TemporaryDirectory() as tmp:
+            homework.STATE_DB = f"{tmp}/state.sqlite3"
+            homework._store = None
+            homework._breakers = {}
+            homework._client = PracticumClient(
+                practicum.endpoint, pool_size=concurrency
+            )
+            homework.HEADERS = {"Authorization": "OAuth token0"}
+            homework.TELEGRAM_CHAT_ID = "0"
+            bot = telegram.Bot(
+                token="123:benchmark",
+                base_url=telegram_api.base_url,
+                request=Request(con_pool_size=concurrency + 4),
+            )
+            subscriptions = parse_subscriptions(
+                json.dumps(
+                    {token: [str(i)] for i, token in enumerate(scripts)}
+                )
+            )
+            states = {
+                subscription.key: PollState(int(practicum.started) - 1)
+                for subscription in subscriptions
+            }
+            polling_engine = None
+            if engine == "async":
+                polling_engine = AsyncPollingEngine(
+                    homework.poll_subscription, concurrency
+                )
+            cpu_started = time.process_time()
+            started = time.monotonic()
+            for _ in range(rounds):
+                round_started = time.monotonic()
+                homework.poll_all(
+                    bot, subscriptions, states, polling_engine
+                )
+                time.sleep(
+                    max(interval - (time.monotonic() - round_started), 0)
+                )
+            elapsed = time.monotonic() - started
+            cpu = time.process_time() - cpu_started
+            if polling_engine is not None:
+                polling_engine.close()
+            api_call_ms = timed(
+                lambda: homework.get_api_answer(int(practicum.started)),
+                samples,
+            )
+            send_call_ms = timed(
+                lambda: homework.send_message(bot, "benchmark"), samples
+            )
+            homework.get_store().close()
+            homework._client.close()
+    finally:
+        for name, value in saved.items():
+            setattr(homework, name, value)
+    latencies = notification_latencies(practicum, telegram_api)
+    return {
+        "tokens": tokens,
+        "engine": engine,
+        "polls": tokens * rounds,
+        "polls_per_sec": round(tokens * rounds / elapsed, 1),
+        "api_requests": practicum.requests,
+        "messages": len(telegram_api.messages),
+        "latency_p50": round(percentile(latencies, 0.5), 3),
+        "latency_p99": round(percentile(latencies, 0.99), 3),
+        "get_api_answer_ms": api_call_ms,
+        "send_message_ms": send_call_ms,
+        "cpu_seconds": round(cpu, 3),
+        "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def main() -> None:
+    """Разбирает аргументы командной строки и печатает метрики."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tokens", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--interval", type=float, default=1)
+    parser.add_argument("--api-latency", type=float, default=0.01)
+    parser.add_argument("--api-error-rate", type=float, default=0)
+    parser.add_argument("--telegram-latency", type=float, default=0.01)
+    parser.add_argument(
+        "--engine", choices=("sync", "async"), default="async"
+    )
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--samples", type=int, default=20)
+    args = parser.parse_args()
+    homework.logger.setLevel(logging.WARNING)
+    print(json.dumps(run(**vars(args)), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Информация о модуле.
+Микробенчмарк проверки ответа API на больших списках работ.
+
+Запуск из корня репозитория:
+    python -m benchmarks.parsing --sizes 100 1000 10000
+"""
+import argparse
+import json
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from benchmarks.simulator import STATUSES, isoformat
+from homework import HOMEWORK_VERDICTS
+from schema import validate_response
+
+
+def make_response(size: int) -> Dict:
+    """Возвращает ответ API с `size` работами."""
+    return {
+        "homeworks": [
+            {
+                "id": i,
+                "homework_name": f"user__hw{i}.zip",
+                "status": STATUSES[i % len(STATUSES)],
+                "reviewer_comment": "Комментарий ревьюера",
+                "date_updated": isoformat(1_600_000_000 + i),
+                "lesson_name": f"Урок {i}",
+            }
+            for i in range(size)
+        ],
+        "current_date": 1_600_000_000,
+    }
+
+
+def legacy_check(response: Dict) -> List[Dict]:
+    """Прежняя проверка: check_response и повторные проверки parse_status."""
+    if not isinstance(response, dict):
+        raise TypeError
+    if "homeworks" not in response:
+        raise KeyError("homeworks")
+    if not response.get("current_date"):
+        raise KeyError("current_date")
+    if not isinstance(response["homeworks"], list):
+        raise TypeError
+    for homework in response["homeworks"]:
+        for key in ("homework_name", "status"):
+            if key not in homework:
+                raise KeyError(key)
+        if homework.get("status") not in HOMEWORK_VERDICTS:
+            raise ValueError(homework.get("status"))
+    return response["homeworks"]
+
+
+def timed(call: Callable, repeats: int) -> float:
+    """Возвращает медианное время вызова в миллисекундах."""
+    durations = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        call()
+        durations.append(time.perf_counter() - started)
+    return statistics.median(durations) * 1000
+
+
+def run(sizes: List[int] = (100, 1000, 10000), repeats: int = 20) -> Dict:
+    """Замеряет разбор и проверку ответов разного размера."""
+    result = {}
+    for size in sizes:
+        body = json.dumps(make_response(size))
+        response = json.loads(body)
+        decode_ms = timed(lambda: json.loads(body), repeats)
+        validate_ms = timed(
+            lambda: validate_response(response, HOMEWORK_VERDICTS), repeats
+        )
+        legacy_ms = timed(lambda: legacy_check(response), repeats)
+        result[size] = {
+            "json_decode_ms": round(decode_ms, 3),
+            "validate_ms": round(validate_ms, 3),
+            "validate_us_per_item": round(validate_ms * 1000 / size, 3),
+            "legacy_check_ms": round(legacy_ms, 3),
+        }
+    return result
+
+
+def main() -> None:
+    """Разбирает аргументы командной строки и печатает метрики."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[100, 1000, 10000]
+    )
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+    print(json.dumps(run(args.sizes, args.repeats), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""Локальные имитаторы API Практикум.Домашка и Telegram Bot API."""
+import json
+import random
+from abc import ABC, abstractmethod
+import threading
+import time
+from datetime import datetime, timezone
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+STATUSES = ("reviewing", "rejected", "reviewing", "approved")
+
+
+def isoformat(timestamp: float) -> str:
+    """Форматирует время так же, как поле date_updated в API."""
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime(
+        "%Y-%m-%dT%H:%M:%SZ"
+    )
+
+
+class FakeServer(ABC):
+    """Информация о классе.
+    HTTP-сервер в фоновом потоке на свободном локальном порту.
+    Наследники задают обработку запросов в методе `handle`.
+    """
+
+    def __init__(self, latency: float = 0, error_rate: float = 0) -> None:
+        self.latency = latency
+        self.error_rate = error_rate
+        self.requests = 0
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                server.dispatch(self)
+
+            def do_POST(self):
+                server.dispatch(self)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(
+            target=self.httpd.serve_forever, daemon=True
+        )
+
+    @property
+    def url(self) -> str:
+        """Базовый адрес сервера."""
+        host, port = self.httpd.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "FakeServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def dispatch(self, request: BaseHTTPRequestHandler) -> None:
+        """Имитирует задержку и сбои, затем вызывает `handle`."""
+        with self.lock:
+            self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if random.random() < self.error_rate:
+            self.reply(request, HTTPStatus.INTERNAL_SERVER_ERROR, {})
+            return
+        status, payload = self.handle(request)
+        self.reply(request, status, payload)
+
+    @abstractmethod
+    def handle(self, request: BaseHTTPRequestHandler) -> Tuple[int, Dict]:
+        """Возвращает код и тело ответа на запрос."""
+
+    @staticmethod
+    def reply(
+        request: BaseHTTPRequestHandler, status: int, payload: Dict
+    ) -> None:
+        """Отправляет JSON-ответ."""
+        body = json.dumps(payload).encode()
+        request.send_response(status)
+        request.send_header("Content-Type", "application/json")
+        request.send_header("Content-Length", str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
+
+
+class FakePracticumAPI(FakeServer):
+    """Информация о классе.
+    Имитирует эндпоинт статусов работ. Для каждого токена задаётся
+    сценарий: список пар (секунд от старта, статус) для одной работы.
+    """
+
+    def __init__(
+        self,
+        scripts: Dict[str, List[Tuple[float, str]]],
+        latency: float = 0,
+        error_rate: float = 0,
+    ) -> None:
+        super().__init__(latency, error_rate)
+        self.scripts = scripts
+        self.started = time.time()
+
+    @property
+    def endpoint(self) -> str:
+        """Адрес, подставляемый вместо ENDPOINT."""
+        return f"{self.url}/api/user_api/homework_statuses/"
+
+    def homework(self, token: str, now: float) -> Optional[Dict]:
+        """Возвращает текущее состояние работы токена."""
+        current = None
+        for offset, status in self.scripts.get(token, ()):
+            if self.started + offset <= now:
+                current = {
+                    "id": token,
+                    "homework_name": f"hw-{token}",
+                    "status": status,
+                    "date_updated": isoformat(self.started + offset),
+                    "changed_at": self.started + offset,
+                }
+        return current
+
+    def handle(self, request: BaseHTTPRequestHandler) -> Tuple[int, Dict]:
+        """Отдаёт работы, изменившиеся после from_date."""
+        token = request.headers.get("Authorization", "")[len("OAuth "):]
+        if token not in self.scripts:
+            return HTTPStatus.UNAUTHORIZED, {"code": "not_authenticated"}
+        query = parse_qs(urlparse(request.path).query)
+        from_date = int(query.get("from_date", ["0"])[0])
+        now = time.time()
+        homework = self.homework(token, now)
+        homeworks = []
+        if homework and homework["changed_at"] >= from_date:
+            homeworks.append(homework)
+        return HTTPStatus.OK, {
+            "homeworks": homeworks,
+            "current_date": int(now),
+        }
+
+
+class FakeTelegramAPI(FakeServer):
+    """Информация о классе.
+    Имитирует метод sendMessage Telegram Bot API и запоминает
+    время получения каждого сообщения.
+    """
+
+    def __init__(self, latency: float = 0, error_rate: float = 0) -> None:
+        super().__init__(latency, error_rate)
+        self.messages: List[Tuple[float, str, str]] = []
+        self.message_id = 0
+
+    @property
+    def base_url(self) -> str:
+        """Адрес для параметра base_url у telegram.Bot."""
+        return f"{self.url}/bot"
+
+    def handle(self, request: BaseHTTPRequestHandler) -> Tuple[int, Dict]:
+        """Принимает сообщение и отвечает как Bot API."""
+        length = int(request.headers.get("Content-Length", 0))
+        data = json.loads(request.rfile.read(length) or b"{}")
+        with self.lock:
+            self.message_id += 1
+            message_id = self.message_id
+            self.messages.append(
+                (time.time(), str(data.get("chat_id")), data.get("text", ""))
+            )
+        return HTTPStatus.OK, {
+            "ok": True,
+            "result": {
+                "message_id": message_id,
+                "date": int(time.time()),
+                "chat": {"id": data.get("chat_id"), "type": "private"},
+                "text": data.get("text", ""),
+            },
+        }
@@ -0,0 +1,76 @@
+"""Информация о модуле.
+Замер холодного старта процесса бота.
+
+Запуск из корня репозитория:
+    python -m benchmarks.startup --runs 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("telegram", "requests", "asyncio", "http.server")
+COMMANDS = {
+    "python": [sys.executable, "-c", "pass"],
+    "import_homework": [sys.executable, "-c", "import homework"],
+    "check": [sys.executable, "homework.py", "--check"],
+    "import_telegram": [sys.executable, "-c", "import homework, telegram"],
+}
+
+
+def measure(command: List[str], runs: int, env: Dict) -> float:
+    """Возвращает медианное время запуска команды в миллисекундах."""
+    durations = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(
+            command, cwd=ROOT, env=env, capture_output=True, check=False
+        )
+        durations.append(time.perf_counter() - started)
+    return round(statistics.median(durations) * 1000, 1)
+
+
+def loaded_heavy_modules(env: Dict) -> List[str]:
+    """Возвращает тяжёлые модули, загруженные при импорте homework."""
+    code = (
+        "import sys, homework; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    ).stdout.strip()
+    return [module for module in output.split(",") if module]
+
+
+def run(runs: int = 10) -> Dict:
+    """Замеряет время старта и возвращает метрики."""
+    env = {
+        **os.environ,
+        "PRACTICUM_TOKEN": "benchmark",
+        "TELEGRAM_TOKEN": "123:benchmark",
+        "TELEGRAM_CHAT_ID": "1",
+    }
+    result = {
+        f"{name}_ms": measure(command, runs, env)
+        for name, command in COMMANDS.items()
+    }
+    result["heavy_modules_on_import"] = loaded_heavy_modules(env)
+    return result
+
+
+def main() -> None:
+    """Разбирает аргументы командной строки и печатает метрики."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+    print(json.dumps(run(args.runs), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""HTTP-клиент API сервиса Практикум.Домашка."""
+from __future__ import annotations
+
+import hashlib
+import re
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    import requests
+
+
+CURRENT_DATE_PATTERN = re.compile(rb'"current_date"\s*:\s*\d+')
+
+
+class ResponseValidators:
+    """Информация о классе.
+    Валидаторы последнего ответа API для одного токена: ETag,
+    Last-Modified и хеш тела без поля current_date, которое
+    меняется в каждом ответе.
+    """
+
+    __slots__ = ("from_date", "etag", "last_modified", "body_hash")
+
+    def __init__(self) -> None:
+        self.from_date: Optional[int] = None
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        self.body_hash: Optional[str] = None
+
+    def request_headers(self, from_date: int) -> Dict:
+        """Возвращает заголовки условного запроса для этого from_date."""
+        if from_date != self.from_date:
+            return {}
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def is_unchanged(self, response: requests.Response) -> bool:
+        """Информация о функции.
+        Сравнивает ответ с предыдущим и запоминает его валидаторы.
+        """
+        body_hash = hashlib.sha1(
+            CURRENT_DATE_PATTERN.sub(b"", response.content)
+        ).hexdigest()
+        unchanged = body_hash == self.body_hash
+        self.remember(response)
+        self.body_hash = body_hash
+        return unchanged
+
+    def remember(self, response: requests.Response) -> None:
+        """Запоминает ETag и Last-Modified ответа, не читая его тело."""
+        self.etag = response.headers.get("ETag")
+        self.last_modified = response.headers.get("Last-Modified")
+        self.body_hash = None
+
+    def forget(self) -> None:
+        """Информация о функции.
+        Сбрасывает валидаторы ответа, который не удалось обработать,
+        чтобы следующий такой же ответ был обработан заново.
+        """
+        self.from_date = None
+        self.etag = None
+        self.last_modified = None
+        self.body_hash = None
+
+
+class PracticumClient:
+    """Информация о классе.
+    Переиспользует соединения с API через `requests.Session`
+    и ограничивает время ожидания ответа сервера.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        pool_size: int = 10,
+        timeout: Tuple[float, float] = (5, 30),
+    ) -> None:
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.endpoint = endpoint
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers["Connection"] = "keep-alive"
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(
+        self, headers: Dict, params: Dict, stream: bool = False
+    ) -> requests.Response:
+        """Делает GET-запрос к эндпоинту через пул соединений."""
+        return self.session.get(
+            self.endpoint,
+            headers=headers,
+            params=params,
+            timeout=self.timeout,
+            stream=stream,
+        )
+
+    def close(self) -> None:
+        """Закрывает все соединения пула."""
+        self.session.close()
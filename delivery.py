@@ -0,0 +1,187 @@
+"""Очередь отправки сообщений в Telegram."""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import telegram
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_LIMIT = 4096
+SEPARATOR = "\n\n"
+
+Job = Callable[[], None]
+Item = Union[str, Job]
+
+
+def is_transient(error: telegram.error.TelegramError) -> bool:
+    """Можно ли повторить отправку после этой ошибки."""
+    if isinstance(error, telegram.error.RetryAfter):
+        return True
+    return isinstance(error, telegram.error.NetworkError) and not isinstance(
+        error, telegram.error.BadRequest
+    )
+
+
+class DeliveryQueue:
+    """Информация о классе.
+    Отправляет сообщения в фоновом потоке, соблюдая ограничения
+    Telegram на частоту сообщений в один чат и в целом для бота.
+    Накопившиеся сообщения одного чата объединяются в одно,
+    временные ошибки Telegram повторяются с экспоненциальной паузой.
+    Кроме текстов в очередь можно поставить задачу, например изменение
+    сообщения: она выполняется отдельно с теми же ограничениями.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[str, str], None],
+        chat_interval: float = 1,
+        global_rate: float = 30,
+        max_retries: int = 5,
+        retry_base: float = 1,
+    ) -> None:
+        self.send = send
+        self.chat_interval = chat_interval
+        self.global_interval = 1 / global_rate
+        self.max_retries = max_retries
+        self.retry_base = retry_base
+        self.pending: "OrderedDict[str, List[Item]]" = OrderedDict()
+        self.next_allowed: Dict[str, float] = {}
+        self.attempts: Dict[str, int] = {}
+        self.next_global = 0.0
+        self.in_flight = 0
+        self.closed = False
+        self.condition = threading.Condition()
+        self.worker = threading.Thread(
+            target=self._run, name="delivery", daemon=True
+        )
+        self.worker.start()
+
+    def put(self, chat_id: str, message: Item) -> None:
+        """Ставит сообщение или задачу для чата в очередь отправки."""
+        with self.condition:
+            self.pending.setdefault(chat_id, []).append(message)
+            self.condition.notify_all()
+
+    def size(self) -> int:
+        """Возвращает число сообщений, ожидающих отправки."""
+        with self.condition:
+            return sum(len(messages) for messages in self.pending.values())
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Ждёт отправки всех сообщений, возвращает успешность."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.condition:
+            while self.pending or self.in_flight:
+                remaining = (
+                    None if deadline is None else deadline - time.monotonic()
+                )
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.condition.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Отправляет оставшиеся сообщения и останавливает поток."""
+        drained = self.join(timeout)
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.worker.join(timeout)
+        return drained
+
+    def _next_ready(self) -> Tuple[Optional[str], Optional[float]]:
+        now = time.monotonic()
+        best_chat, best_at = None, None
+        for chat_id in self.pending:
+            ready_at = max(self.next_allowed.get(chat_id, 0), self.next_global)
+            if best_at is None or ready_at < best_at:
+                best_chat, best_at = chat_id, ready_at
+        if best_chat is None:
+            return None, None
+        return best_chat, best_at - now
+
+    def _take(self, chat_id: str) -> Item:
+        messages = self.pending.pop(chat_id)
+        if callable(messages[0]):
+            job = messages.pop(0)
+            if messages:
+                self.pending[chat_id] = messages
+            return job
+        taken = [messages.pop(0)]
+        length = len(taken[0])
+        while messages and isinstance(messages[0], str) and (
+            length + len(SEPARATOR) + len(messages[0]) <= MESSAGE_LIMIT
+        ):
+            length += len(SEPARATOR) + len(messages[0])
+            taken.append(messages.pop(0))
+        if messages:
+            self.pending[chat_id] = messages
+        return SEPARATOR.join(taken)
+
+    def _run(self) -> None:
+        while True:
+            with self.condition:
+                while True:
+                    if self.closed and not self.pending:
+                        return
+                    chat_id, wait = self._next_ready()
+                    if chat_id is not None and wait <= 0:
+                        break
+                    self.condition.wait(wait)
+                text = self._take(chat_id)
+                self.in_flight += 1
+            try:
+                self._deliver(chat_id, text)
+            finally:
+                with self.condition:
+                    self.in_flight -= 1
+                    self.condition.notify_all()
+
+    def _deliver(self, chat_id: str, text: Item) -> None:
+        try:
+            if callable(text):
+                text()
+            else:
+                with metrics.SEND_SECONDS.time():
+                    self.send(chat_id, text)
+        except telegram.error.TelegramError as error:
+            metrics.SEND_FAILURES.inc()
+            self._handle_error(chat_id, text, error)
+        except Exception as error:
+            metrics.SEND_FAILURES.inc()
+            with self.condition:
+                self.attempts.pop(chat_id, None)
+            logger.error(f"Сбой при отправке в чат {chat_id}: {error}")
+        else:
+            logger.debug("Сообщение успешно отправлено")
+            with self.condition:
+                now = time.monotonic()
+                self.attempts.pop(chat_id, None)
+                self.next_allowed[chat_id] = now + self.chat_interval
+                self.next_global = now + self.global_interval
+
+    def _handle_error(
+        self, chat_id: str, text: Item, error: telegram.error.TelegramError
+    ) -> None:
+        with self.condition:
+            attempt = self.attempts.get(chat_id, 0) + 1
+            if not is_transient(error) or attempt > self.max_retries:
+                self.attempts.pop(chat_id, None)
+                logger.error(f"Не удается отправить сообщение в чат. {error}")
+                return
+            delay = getattr(error, "retry_after", None) or (
+                self.retry_base * 2 ** (attempt - 1)
+            )
+            logger.warning(
+                f"Повторная отправка в чат через {delay} с: {error}"
+            )
+            self.attempts[chat_id] = attempt
+            self.pending[chat_id] = [text] + self.pending.get(chat_id, [])
+            self.pending.move_to_end(chat_id, last=False)
+            self.next_allowed[chat_id] = time.monotonic() + delay
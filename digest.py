@@ -0,0 +1,162 @@
+"""Сводки: накопление изменений статусов и отправка одним сообщением."""
+import logging
+import threading
+import time
+from typing import Callable, Collection, Dict, List, Optional, Tuple
+
+from delivery import MESSAGE_LIMIT, SEPARATOR
+from messages import DEFAULT_LOCALE, DIGEST_HEADERS
+from state import StateStore
+
+logger = logging.getLogger(__name__)
+
+
+def split_digest(
+    messages: List[str], header: Optional[str] = None
+) -> List[str]:
+    """Информация о функции.
+    Собирает сводку из сообщений и делит её на части, не превышающие
+    ограничение Telegram на длину сообщения. Без `header` заголовок
+    сводки берётся на языке по умолчанию.
+    """
+    return [part for part, _ in digest_parts(messages, header)]
+
+
+def digest_parts(
+    messages: List[str], header: Optional[str] = None
+) -> List[Tuple[str, int]]:
+    """Делит сводку на части и возвращает их с числом сообщений в каждой."""
+    if header is None:
+        header = DIGEST_HEADERS[DEFAULT_LOCALE].format(count=len(messages))
+    parts = []
+    current = [header]
+    count = 0
+    length = len(header)
+    for message in messages:
+        message = message[:MESSAGE_LIMIT]
+        if length + len(SEPARATOR) + len(message) > MESSAGE_LIMIT:
+            parts.append((SEPARATOR.join(current), count))
+            current, count, length = [], 0, -len(SEPARATOR)
+        current.append(message)
+        count += 1
+        length += len(SEPARATOR) + len(message)
+    parts.append((SEPARATOR.join(current), count))
+    return parts
+
+
+class DigestBuffer:
+    """Информация о классе.
+    Копит уведомления каждого чата и отправляет их одной сводкой,
+    когда с первого накопленного сообщения прошло `window` секунд.
+    Накопленное сохраняется в хранилище и переживает перезапуск.
+    Если заданы `subscriptions`, после перезапуска загружаются только
+    сообщения этих подписок: шарды с общей базой не дублируют сводки
+    друг друга. Заголовок сводки чата возвращает `header(chat_id, count)`.
+    Сообщения удаляются из хранилища только после отправки их части
+    сводки: если `send` выбрасывает исключение, неотправленное
+    возвращается в буфер и уходит при следующей проверке.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[str, str], None],
+        window: float,
+        store: Optional[StateStore] = None,
+        header: Optional[Callable[[str, int], str]] = None,
+        subscriptions: Optional[Collection[str]] = None,
+    ) -> None:
+        self.send = send
+        self.window = window
+        self.store = store
+        self.header = header
+        self.lock = threading.Lock()
+        self.started: Dict[str, float] = {}
+        self.pending: Dict[str, List[str]] = {}
+        self.rowids: Dict[str, List[int]] = {}
+        if store is not None:
+            for rowid, subscription, chat_id, created_at, message in (
+                store.load_digests()
+            ):
+                if subscriptions is None or subscription in subscriptions:
+                    self.started.setdefault(chat_id, created_at)
+                    self.pending.setdefault(chat_id, []).append(message)
+                    self.rowids.setdefault(chat_id, []).append(rowid)
+
+    def put(self, chat_id: str, message: str, subscription: str = "") -> None:
+        """Добавляет сообщение подписки в сводку чата."""
+        now = time.time()
+        with self.lock:
+            self.started.setdefault(chat_id, now)
+            self.pending.setdefault(chat_id, []).append(message)
+            if self.store is not None:
+                self.rowids.setdefault(chat_id, []).append(
+                    self.store.add_digest(subscription, chat_id, now, message)
+                )
+
+    def size(self) -> int:
+        """Возвращает число сообщений, ожидающих сводки."""
+        with self.lock:
+            return sum(len(messages) for messages in self.pending.values())
+
+    def flush_due(self, now: Optional[float] = None) -> int:
+        """Отправляет сводки, окно которых истекло, возвращает их число."""
+        now = time.time() if now is None else now
+        with self.lock:
+            due = [
+                (chat_id, started)
+                for chat_id, started in self.started.items()
+                if started + self.window <= now
+            ]
+            digests = [
+                (
+                    chat_id,
+                    started,
+                    self.pending.pop(chat_id),
+                    self.rowids.pop(chat_id, []),
+                )
+                for chat_id, started in due
+            ]
+            for chat_id, _ in due:
+                del self.started[chat_id]
+        return sum(
+            self._send_digest(chat_id, started, messages, rowids)
+            for chat_id, started, messages, rowids in digests
+        )
+
+    def _send_digest(
+        self,
+        chat_id: str,
+        started: float,
+        messages: List[str],
+        rowids: List[int],
+    ) -> bool:
+        header = None
+        if self.header is not None:
+            header = self.header(chat_id, len(messages))
+        sent = 0
+        try:
+            for part, count in digest_parts(messages, header):
+                self.send(chat_id, part)
+                sent += count
+        except Exception as error:
+            logger.error(f"Не удается отправить сводку в чат. {error}")
+            self._requeue(chat_id, started, messages[sent:], rowids[sent:])
+            return False
+        finally:
+            if self.store is not None and rowids[:sent]:
+                self.store.delete_digests(rowids[:sent])
+        return True
+
+    def _requeue(
+        self,
+        chat_id: str,
+        started: float,
+        messages: List[str],
+        rowids: List[int],
+    ) -> None:
+        with self.lock:
+            self.started[chat_id] = min(
+                started, self.started.get(chat_id, started)
+            )
+            self.pending[chat_id] = messages + self.pending.get(chat_id, [])
+            self.rowids[chat_id] = rowids + self.rowids.get(chat_id, [])
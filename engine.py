@@ -0,0 +1,63 @@
+"""Асинхронный движок опроса множества подписок."""
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from subscriptions import PollState, Subscription
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncPollingEngine:
+    """Информация о классе.
+    Опрашивает подписки одного раунда конкурентно. Синхронные запросы
+    к API и Telegram выполняются в пуле потоков, а семафор ограничивает
+    число одновременных запросов к Практикуму. Если `stopped` вернул
+    True, ещё не начатые опросы раунда пропускаются.
+    """
+
+    def __init__(self, poll: Callable, concurrency: int) -> None:
+        self.poll = poll
+        self.concurrency = concurrency
+        self.executor = ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="poll"
+        )
+
+    def run_round(
+        self,
+        bot,
+        subscriptions: List[Subscription],
+        states: Dict[str, PollState],
+        stopped: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        """Опрашивает все подписки и ждёт завершения раунда."""
+        asyncio.run(self._run_round(bot, subscriptions, states, stopped))
+
+    async def _run_round(self, bot, subscriptions, states, stopped) -> None:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        loop = asyncio.get_running_loop()
+
+        async def poll_one(subscription: Subscription) -> None:
+            async with semaphore:
+                if stopped is not None and stopped():
+                    return
+                await loop.run_in_executor(
+                    self.executor,
+                    self.poll,
+                    bot,
+                    subscription,
+                    states[subscription.key],
+                )
+
+        results = await asyncio.gather(
+            *(poll_one(subscription) for subscription in subscriptions),
+            return_exceptions=True,
+        )
+        for error in results:
+            if isinstance(error, Exception):
+                logger.error(f"Сбой при опросе подписки: {error}")
+
+    def close(self) -> None:
+        """Останавливает пул потоков."""
+        self.executor.shutdown(wait=True)
@@ -7,16 +7,56 @@ class ProjStatusNotFoundError(Exception):
 class HttpStatusNotOkError(Exception):
     """Статус-код запроса к API домашки неуспешен."""
 
+    def __init__(self, message, status_code=None, retry_after=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class ValueIsNotListError(TypeError):
+    """В ответе API тип данных не является списком."""
+
     pass
 
 
-class ResponseIsEmptyError(IndexError):
-    """В ответе ничего не приходит."""
+class MessageNotSentError(Exception):
+    """Сообщение не удалось отправить в Telegram."""
 
     pass
 
 
-class ValueIsNotListError(TypeError):
-    """В ответе API тип данных не является списком."""
+class ApiRequestError(Exception):
+    """Запрос к API домашки не удался."""
+
+    pass
+
+
+class CircuitOpenError(Exception):
+    """Запросы к API домашки приостановлены после серии сбоев."""
 
     pass
+
+
+class ResponseIsNotDictError(TypeError):
+    """Ответ API или запись о работе не является словарем."""
+
+    pass
+
+
+class KeyIsMissingError(KeyError):
+    """В ответе API нет обязательного ключа."""
+
+    def __str__(self):
+        return str(self.args[0]) if self.args else ""
+
+
+class InvalidHomeworksError(Exception):
+    """Часть записей о работах в ответе API некорректна."""
+
+    def __init__(self, errors, homeworks=()):
+        super().__init__(
+            f"Пропущено некорректных записей о работах: {len(errors)}. "
+            f"{errors[0]}"
+        )
+        self.errors = list(errors)
+        self.homeworks = list(homeworks)
@@ -1,34 +1,119 @@
+from __future__ import annotations
+
 import os
 import sys
+import threading
 import time
-import requests
 
 import logging
 
-import telegram
-
 from dotenv import load_dotenv
 
 from http import HTTPStatus
-from typing import Dict, List, NoReturn
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NoReturn,
+    Optional,
+    Tuple,
+    Union,
+)
 
+import metrics
+from logs import setup_logging
+from messages import DEFAULT_LOCALE, VERDICTS, ChatPreference, MessageRenderer
+from profiling import ProfileDumper, SpanRecorder
+from client import PracticumClient, ResponseValidators
+from resilience import CircuitBreaker, RetryPolicy, parse_retry_after
+from scheduler import PollScheduler
+from sharding import partition, shard_from_dyno
+from shutdown import ShutdownCoordinator
+from schema import (
+    Homework, parse_homework, validate_response, validate_stream
+)
+from sources import PollingSource, StatusSource, WebhookSource
+from state import StateStore
+from streaming import CHUNK_SIZE, ResponseStream
+from subscriptions import PollState, Subscription, load_subscriptions
 from exceptions import (
-    ProjStatusNotFoundError,
+    ApiRequestError,
+    CircuitOpenError,
     HttpStatusNotOkError,
-    ResponseIsEmptyError,
-    ValueIsNotListError,
+    InvalidHomeworksError,
+    MessageNotSentError,
 )
 
+if TYPE_CHECKING:
+    import requests
+    import telegram
+
+    from delivery import DeliveryQueue
+    from digest import DigestBuffer
+    from engine import AsyncPollingEngine
+
 load_dotenv()
 
 PRACTICUM_TOKEN = os.getenv("PRACTICUM_TOKEN")
 TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
+SUBSCRIPTIONS_FILE = os.getenv("SUBSCRIPTIONS_FILE")
+SUBSCRIPTIONS = os.getenv("SUBSCRIPTIONS")
 
 RETRY_PERIOD = 600
 ONE_DAY = 60 * 60 * 24
-ENDPOINT = "https://practicum.yandex.ru/api/user_api/homework_statuses/"
+STATE_DB = os.getenv("STATE_DB", "state.sqlite3")
+ENDPOINT = os.getenv(
+    "ENDPOINT", "https://practicum.yandex.ru/api/user_api/homework_statuses/"
+)
 HEADERS = {"Authorization": f"OAuth {PRACTICUM_TOKEN}"}
+API_POOL_SIZE = int(os.getenv("API_POOL_SIZE", 10))
+API_CONNECT_TIMEOUT = float(os.getenv("API_CONNECT_TIMEOUT", 5))
+API_READ_TIMEOUT = float(os.getenv("API_READ_TIMEOUT", 30))
+STREAM_RESPONSES = os.getenv("STREAM_RESPONSES", "").lower() in ("1", "true")
+POLLING_ENGINE = os.getenv("POLLING_ENGINE", "sync")
+API_CONCURRENCY = int(os.getenv("API_CONCURRENCY", 10))
+ADAPTIVE_POLLING = os.getenv("ADAPTIVE_POLLING", "").lower() in ("1", "true")
+POLL_MIN_INTERVAL = float(os.getenv("POLL_MIN_INTERVAL", 60))
+POLL_MAX_INTERVAL = float(os.getenv("POLL_MAX_INTERVAL", 6 * 60 * 60))
+POLL_REVIEWING_INTERVAL = float(os.getenv("POLL_REVIEWING_INTERVAL", 120))
+POLL_JITTER = float(os.getenv("POLL_JITTER", 0.1))
+DELIVERY_QUEUE = os.getenv("DELIVERY_QUEUE", "").lower() in ("1", "true")
+TELEGRAM_CHAT_INTERVAL = float(os.getenv("TELEGRAM_CHAT_INTERVAL", 1))
+TELEGRAM_GLOBAL_RATE = float(os.getenv("TELEGRAM_GLOBAL_RATE", 30))
+DIGEST_WINDOW = float(os.getenv("DIGEST_WINDOW", 0))
+EDIT_MESSAGES = os.getenv("EDIT_MESSAGES", "").lower() in ("1", "true")
+EDIT_GONE_ERRORS = (
+    "message to edit not found",
+    "message can't be edited",
+    "message_id_invalid",
+)
+STATUS_SOURCE = os.getenv("STATUS_SOURCE", "poll")
+STATUS_SOURCES = ("poll", "webhook", "both")
+WEBHOOK_HOST = os.getenv("WEBHOOK_HOST", "127.0.0.1")
+WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", 8080))
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET")
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", 1))
+SHARD_INDEX = os.getenv("SHARD_INDEX")
+SHARD_WORKERS = int(os.getenv("SHARD_WORKERS", 1))
+SUPERVISE_INTERVAL = float(os.getenv("SUPERVISE_INTERVAL", 5))
+SHUTDOWN_TIMEOUT = float(os.getenv("SHUTDOWN_TIMEOUT", 25))
+PROFILE_SPANS = os.getenv("PROFILE_SPANS", "").lower() in ("1", "true")
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_DURATION = float(os.getenv("PROFILE_DURATION", 60))
+PROFILE_ON_START = os.getenv("PROFILE_ON_START", "").lower() in ("1", "true")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", 0))
+ERROR_QUIET_PERIOD = float(os.getenv("ERROR_QUIET_PERIOD", 60 * 60))
+RETRY_BASE = float(os.getenv("RETRY_BASE", 60))
+RETRY_CAP = float(os.getenv("RETRY_CAP", 60 * 60))
+BREAKER_THRESHOLD = int(os.getenv("BREAKER_THRESHOLD", 5))
+BREAKER_RESET_TIMEOUT = float(os.getenv("BREAKER_RESET_TIMEOUT", 300))
 
 
 HOMEWORK_VERDICTS = {
@@ -36,17 +121,22 @@ HOMEWORK_VERDICTS = {
     "reviewing": "Работа взята на проверку ревьюером.",
     "rejected": "Работа проверена: у ревьюера есть замечания.",
 }
+RENDERER = MessageRenderer({DEFAULT_LOCALE: HOMEWORK_VERDICTS, **VERDICTS})
 
 
+setup_logging(LOG_LEVEL, LOG_FORMAT)
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
-handler = logging.StreamHandler(stream=sys.stdout)
-logger.addHandler(handler)
-formatter = logging.Formatter(
-    "%(asctime)s - %(module)s - %(lineno)d \
-        - %(name)s - %(levelname)s - %(message)s"
-)
-handler.setFormatter(formatter)
+SPANS = SpanRecorder(PROFILE_SPANS)
+PROFILER = ProfileDumper(PROFILE_DIR, PROFILE_DURATION)
+
+_client = None
+_client_lock = threading.Lock()
+_store = None
+_breakers: Dict[str, CircuitBreaker] = {}
+_delivery = None
+_digest = None
+
+RETRYABLE_ERRORS = (ApiRequestError, HttpStatusNotOkError)
 
 
 def check_tokens() -> bool:
@@ -54,71 +144,665 @@ def check_tokens() -> bool:
     Проверяет доступность переменных окружения,
     которые необходимы для работы программы.
     """
+    if SUBSCRIPTIONS_FILE or SUBSCRIPTIONS:
+        return bool(TELEGRAM_TOKEN)
     return all([PRACTICUM_TOKEN, TELEGRAM_TOKEN, TELEGRAM_CHAT_ID])
 
 
-def send_message(bot: telegram.Bot, message: str) -> None:
-    """Отправляет сообщение в Telegram чат."""
+def send_to_chat(
+    bot: telegram.Bot, chat_id: str, message: str
+) -> Optional[int]:
+    """Отправляет сообщение в чат и возвращает его идентификатор."""
+    import telegram
+
     logger.info("Начало отправки сообщения в Telegram")
     try:
-        bot.send_message(TELEGRAM_CHAT_ID, message)
+        with metrics.SEND_SECONDS.time(), SPANS.span("send"):
+            sent = bot.send_message(chat_id, message)
     except telegram.error.TelegramError as error:
-        logging.error(f"Не удается отправить вообщение в чат. {error}")
-    else:
-        logger.debug("Сообщение успешно отправлено")
+        metrics.SEND_FAILURES.inc()
+        logger.error(f"Не удается отправить вообщение в чат. {error}")
+        return None
+    logger.debug("Сообщение успешно отправлено")
+    return getattr(sent, "message_id", None)
+
+
+def edit_in_chat(
+    bot: telegram.Bot, chat_id: str, message_id: int, message: str
+) -> bool:
+    """Информация о функции.
+    Заменяет текст отправленного сообщения. Возвращает False, если
+    сообщение удалено или его больше нельзя изменить. Остальные ошибки
+    Telegram, в том числе временные, пробрасываются вызывающему.
+    """
+    import telegram
+
+    try:
+        with metrics.SEND_SECONDS.time(), SPANS.span("send"):
+            bot.edit_message_text(
+                message, chat_id=chat_id, message_id=message_id
+            )
+    except telegram.error.BadRequest as error:
+        reason = str(error).lower()
+        if "not modified" in reason:
+            return True
+        if any(gone in reason for gone in EDIT_GONE_ERRORS):
+            logger.warning(f"Не удается изменить сообщение: {error}")
+            return False
+        raise
+    metrics.MESSAGE_EDITS.inc()
+    logger.debug("Сообщение успешно изменено")
+    return True
+
+
+def send_message(bot: telegram.Bot, message: str) -> None:
+    """Отправляет сообщение в Telegram чат."""
+    send_to_chat(bot, TELEGRAM_CHAT_ID, message)
+
+
+def get_client() -> PracticumClient:
+    """Информация о функции.
+    Возвращает общий HTTP-клиент API, создавая его при первом вызове.
+    Первый раунд async-движка вызывает функцию из нескольких потоков,
+    поэтому клиент создаётся под блокировкой.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = PracticumClient(
+                    ENDPOINT,
+                    pool_size=max(API_POOL_SIZE, API_CONCURRENCY),
+                    timeout=(API_CONNECT_TIMEOUT, API_READ_TIMEOUT),
+                )
+    return _client
+
+
+def get_breaker(headers: Dict) -> CircuitBreaker:
+    """Информация о функции.
+    Возвращает выключатель запросов к API для токена из заголовков.
+    У каждого токена свой выключатель, чтобы сбои или 429 по одному
+    токену не останавливали опрос остальных.
+    """
+    authorization = headers.get("Authorization", "")
+    breaker = _breakers.get(authorization)
+    if breaker is None:
+        breaker = _breakers.setdefault(
+            authorization,
+            CircuitBreaker(BREAKER_THRESHOLD, BREAKER_RESET_TIMEOUT),
+        )
+    return breaker
 
 
 def get_api_answer(timestamp: int) -> Dict:
     """Делает запрос к единственному эндпоинту API-сервиса."""
+    return fetch_statuses(HEADERS, timestamp)
+
+
+def fetch_statuses(
+    headers: Dict,
+    timestamp: int,
+    validators: Optional[ResponseValidators] = None,
+    stream: bool = False,
+) -> Union[Dict, ResponseStream, None]:
+    """Информация о функции.
+    Запрашивает статусы работ с заголовками конкретного токена.
+    Если переданы валидаторы прошлого ответа, делает условный запрос
+    и возвращает None, когда ответ не изменился. С `stream` тело
+    не загружается целиком, а возвращается ResponseStream.
+    """
+    import requests
+
+    breaker = get_breaker(headers)
+    if not breaker.allow():
+        raise CircuitOpenError(
+            "API временно недоступно, запросы приостановлены"
+        )
     logger.info("Начали запрос к API")
     payload = {"from_date": timestamp}
+    if validators is not None:
+        headers = {**headers, **validators.request_headers(timestamp)}
     try:
-        response = requests.get(ENDPOINT, headers=HEADERS, params=payload)
+        with metrics.API_REQUEST_SECONDS.time(), SPANS.span("fetch"):
+            response = get_client().get(headers, payload, stream=stream)
     except requests.RequestException as error:
-        raise error(f"Ошибка при запросе к основному API: {error}")
+        metrics.API_RESPONSES.inc(code="error")
+        breaker.record_failure()
+        raise ApiRequestError(
+            f"Ошибка при запросе к основному API: {error}"
+        ) from error
+    metrics.API_RESPONSES.inc(code=str(response.status_code))
+    if (
+        response.status_code >= HTTPStatus.INTERNAL_SERVER_ERROR
+        or response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    ):
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    if stream and response.status_code != HTTPStatus.OK:
+        response.close()
+    if response.status_code == HTTPStatus.NOT_MODIFIED:
+        logger.debug("Ответ API не изменился")
+        metrics.DEDUP_HITS.inc(kind="response")
+        return None
     if response.status_code != HTTPStatus.OK:
         raise HttpStatusNotOkError(
-            f"Ошибка запроса {response.status_code} {response.reason}"
+            f"Ошибка запроса {response.status_code} {response.reason}",
+            status_code=response.status_code,
+            retry_after=parse_retry_after(response.headers.get("Retry-After")),
         )
-    return response.json()
+    return read_body(response, timestamp, validators, stream)
 
 
-def check_response(response: Dict) -> Dict:
-    """Проверяет ответ API на соответствие документации."""
-    if not isinstance(response, dict):
-        raise TypeError(f"Переменная {response} не является словарем.")
-    if not response.get("homeworks"):
-        raise KeyError("Нет доступных значений в ответе сервера: homeworks")
-    if not response.get("current_date"):
-        raise KeyError("Нет доступных значений в ответе сервера: current_date")
-    if not isinstance(response["homeworks"], list):
-        raise ValueIsNotListError(
-            f"В ответе API домашки под ключом `homeworks` данные приходят\
-             не в виде списка, {type(response['homeworks'])}."
+def read_body(
+    response: requests.Response,
+    timestamp: int,
+    validators: Optional[ResponseValidators],
+    stream: bool,
+) -> Union[Dict, ResponseStream, None]:
+    """Информация о функции.
+    Возвращает тело успешного ответа или None, если оно не изменилось.
+    Поток не сравнивается по хешу тела, запоминаются только ETag
+    и Last-Modified.
+    """
+    if stream:
+        if validators is not None:
+            validators.remember(response)
+            validators.from_date = timestamp
+        return ResponseStream(
+            response.iter_content(CHUNK_SIZE), response.close
         )
-    if not response.get("homeworks")[0]:
-        raise ResponseIsEmptyError("Список работ пуст")
-    return response.get("homeworks")[0]
+    if validators is not None:
+        unchanged = validators.is_unchanged(response)
+        validators.from_date = timestamp
+        if unchanged:
+            logger.debug("Ответ API не изменился")
+            metrics.DEDUP_HITS.inc(kind="response")
+            return None
+    return response.json()
 
 
-def parse_status(homework: Dict) -> str:
+@metrics.CHECK_RESPONSE_SECONDS.time()
+def check_response(response: Dict) -> List[Homework]:
+    """Проверяет ответ API и возвращает список изменившихся работ."""
+    return validate_response(response, HOMEWORK_VERDICTS)
+
+
+@metrics.PARSE_STATUS_SECONDS.time()
+def parse_status(homework: Union[Dict, Homework]) -> str:
     """Информация о функции.
     Извлекает из информации о конкретной
     домашней работе статус этой работы.
+    Запись из check_response уже проверена и повторно не проверяется.
     """
-    data_of_hw = ("homework_name", "status")
-    for data in data_of_hw:
-        if data not in homework:
-            raise KeyError(f"Ключ {data} отсутствует в ответе сервера")
+    if not isinstance(homework, Homework):
+        homework = parse_homework(homework, HOMEWORK_VERDICTS)
+    return RENDERER.render(homework)
+
+
+def get_store() -> StateStore:
+    """Возвращает общее хранилище состояния, открывая его при первом вызове."""
+    global _store
+    if _store is None:
+        _store = StateStore(STATE_DB)
+    return _store
+
+
+def get_subscriptions() -> List[Subscription]:
+    """Информация о функции.
+    Возвращает подписки из SUBSCRIPTIONS_FILE или SUBSCRIPTIONS,
+    а если они не заданы, единственную подписку из переменных окружения.
+    """
+    subscriptions = load_subscriptions(SUBSCRIPTIONS_FILE, SUBSCRIPTIONS)
+    if subscriptions:
+        return subscriptions
+    return [Subscription(PRACTICUM_TOKEN, (TELEGRAM_CHAT_ID,))]
+
+
+def shard_index() -> Optional[int]:
+    """Возвращает номер шарда из SHARD_INDEX или имени процесса Heroku."""
+    if SHARD_INDEX is not None:
+        return int(SHARD_INDEX)
+    return shard_from_dyno(os.getenv("DYNO"))
+
 
-    homework_name = homework.get("homework_name")
-    message = homework.get("status")
-    if message not in HOMEWORK_VERDICTS:
-        raise ProjStatusNotFoundError(
-            f"Неопределенный статус работы: {message}"
+def get_shard_subscriptions() -> List[Subscription]:
+    """Информация о функции.
+    Возвращает подписки, которые опрашивает этот процесс. При
+    SHARD_COUNT > 1 подписки делятся между шардами по консистентному
+    хешу, так что один токен опрашивает ровно один процесс.
+    """
+    subscriptions = get_subscriptions()
+    if SHARD_COUNT <= 1:
+        return subscriptions
+    index = shard_index()
+    if index is None or not 0 <= index < SHARD_COUNT:
+        raise ValueError(
+            f"Номер шарда {index} вне диапазона 0..{SHARD_COUNT - 1}"
         )
-    verdict = HOMEWORK_VERDICTS[message]
-    return f'Изменился статус проверки работы "{homework_name}". {verdict}'
+    return partition(subscriptions, index, SHARD_COUNT)
+
+
+def detect_changes(
+    homeworks: Iterable[Homework], statuses: Dict
+) -> Iterator[Homework]:
+    """Отбирает по мере поступления работы с изменившимся статусом."""
+    for homework in homeworks:
+        with SPANS.span("dedup"):
+            unchanged = statuses.get(homework.key) == homework.version
+        if unchanged:
+            metrics.DEDUP_HITS.inc(kind="homework")
+        else:
+            yield homework
+
+
+def notify(
+    bot: telegram.Bot,
+    subscription: Subscription,
+    message: str,
+    homework: Optional[Homework] = None,
+) -> None:
+    """Информация о функции.
+    Рассылает сообщение во все чаты подписки. Если передана работа,
+    чатам с собственными настройками языка или подробности сообщение
+    собирается заново по их шаблону, а в режиме сводок оно
+    откладывается до отправки сводки. В режиме EDIT_MESSAGES у каждой
+    работы в чате одно сообщение, которое обновляется при смене статуса.
+    """
+    for chat_id in subscription.chat_ids:
+        text = message
+        preference = subscription.preference(chat_id)
+        if homework is not None and preference != ChatPreference():
+            text = RENDERER.render(homework, preference)
+        if homework is not None and _digest is not None:
+            _digest.put(chat_id, text, subscription.key)
+        elif homework is not None and EDIT_MESSAGES:
+            update_live_message(bot, subscription, chat_id, homework, text)
+        else:
+            deliver(bot, chat_id, text)
+
+
+def update_live_message(
+    bot: telegram.Bot,
+    subscription: Subscription,
+    chat_id: str,
+    homework: Homework,
+    message: str,
+) -> None:
+    """Информация о функции.
+    Обновляет сообщение о работе, отправленное в чат раньше. С очередью
+    отправки изменение выполняется в ней, с теми же ограничениями
+    частоты и повторами временных ошибок. Без очереди ошибка Telegram
+    логируется, а новое сообщение не отправляется, чтобы не плодить
+    дубли при перебоях связи.
+    """
+    import telegram
+
+    def replace() -> None:
+        replace_live_message(bot, subscription, chat_id, homework, message)
+
+    if _delivery is not None:
+        _delivery.put(chat_id, PROFILER.profiled(replace))
+        return
+    try:
+        replace()
+    except telegram.error.TelegramError as error:
+        metrics.SEND_FAILURES.inc()
+        logger.error(f"Не удается обновить сообщение в чате. {error}")
+
+
+def replace_live_message(
+    bot: telegram.Bot,
+    subscription: Subscription,
+    chat_id: str,
+    homework: Homework,
+    message: str,
+) -> None:
+    """Информация о функции.
+    Изменяет сообщение о работе, а если его нет или оно удалено,
+    отправляет новое и запоминает его идентификатор. Ошибки Telegram
+    пробрасываются.
+    """
+    store = get_store()
+    message_id = store.load_message_id(
+        chat_id, subscription.key, homework.key
+    )
+    if message_id is not None and edit_in_chat(
+        bot, chat_id, message_id, message
+    ):
+        return
+    with metrics.SEND_SECONDS.time(), SPANS.span("send"):
+        sent = bot.send_message(chat_id, message)
+    logger.debug("Сообщение успешно отправлено")
+    store.save_message_id(
+        chat_id, subscription.key, homework.key, sent.message_id
+    )
+
+
+def deliver(bot: telegram.Bot, chat_id: str, message: str) -> None:
+    """Отправляет сообщение сразу или через очередь отправки."""
+    if _delivery is not None:
+        _delivery.put(chat_id, message)
+    else:
+        send_to_chat(bot, chat_id, message)
+
+
+def send_digest(bot: telegram.Bot, chat_id: str, message: str) -> None:
+    """Информация о функции.
+    Отправляет часть сводки сразу или через очередь отправки.
+    Без очереди сбой отправки пробрасывается, чтобы сводка осталась
+    в хранилище и была отправлена при следующей проверке.
+    """
+    if _delivery is not None:
+        _delivery.put(chat_id, message)
+    elif send_to_chat(bot, chat_id, message) is None:
+        raise MessageNotSentError(f"Сводка не отправлена в чат {chat_id}")
+
+
+def error_kind(error: Exception) -> str:
+    """Возвращает вид ошибки: класс и HTTP-статус, если он есть."""
+    status_code = getattr(error, "status_code", None)
+    if status_code is None:
+        return type(error).__name__
+    return f"{type(error).__name__}:{status_code}"
+
+
+def report_error(
+    bot: telegram.Bot,
+    subscription: Subscription,
+    state: PollState,
+    error: Exception,
+) -> None:
+    """Информация о функции.
+    Логирует сбой и сообщает о нём в чаты не чаще раза
+    в ERROR_QUIET_PERIOD для каждого вида ошибки, чтобы меняющийся
+    текст ошибки не приводил к сообщению на каждой итерации.
+    """
+    logger.error(error)
+    kind = error_kind(error)
+    state.error = kind
+    now = time.monotonic()
+    reported_at = state.error_reported.get(kind)
+    if reported_at is not None and now - reported_at < ERROR_QUIET_PERIOD:
+        metrics.ERROR_REPORTS.inc(error=kind, result="suppressed")
+        return
+    metrics.ERROR_REPORTS.inc(error=kind, result="sent")
+    notify(bot, subscription, f"Сбой в работе программы: {error}")
+    state.error_reported[kind] = now
+
+
+def report_recovery(
+    bot: telegram.Bot, subscription: Subscription, state: PollState
+) -> None:
+    """Информация о функции.
+    Сообщает о восстановлении, если после прошлого восстановления
+    о сбое было отправлено сообщение и с него не прошёл период тишины.
+    Время сообщений о сбоях не сбрасывается, поэтому при чередовании
+    сбоев и успешных опросов в чат уходит одна пара сообщений
+    за ERROR_QUIET_PERIOD.
+    """
+    if state.error is None:
+        return
+    state.error = None
+    now = time.monotonic()
+    reported_at = max(state.error_reported.values(), default=None)
+    if (
+        reported_at is None
+        or reported_at <= state.recovered_at
+        or now - reported_at >= ERROR_QUIET_PERIOD
+    ):
+        return
+    logger.info("Работа программы восстановлена")
+    notify(bot, subscription, "Работа программы восстановлена.")
+    state.recovered_at = now
+
+
+def handle_response(
+    bot: telegram.Bot,
+    subscription: Subscription,
+    state: PollState,
+    response: Union[Dict, ResponseStream, None],
+) -> bool:
+    """Информация о функции.
+    Проверяет ответ API, полученный опросом или push-запросом,
+    и отправляет в чаты подписки по сообщению на каждую работу
+    с изменившимся статусом. None означает неизменившийся ответ.
+    Ответ-поток проверяется по одной работе по мере чтения, а в памяти
+    до конца проверки остаются только работы с новым статусом.
+    Некорректные записи о работах не мешают остальным: о них
+    сообщается как о сбое, а from_date всё равно сдвигается.
+    Возвращает True, если все записи ответа корректны.
+    """
+    skipped: List[Exception] = []
+    if isinstance(response, ResponseStream):
+        changed: List[Homework] = []
+        with response:
+            try:
+                changed.extend(detect_changes(
+                    validate_stream(response, HOMEWORK_VERDICTS),
+                    state.statuses,
+                ))
+            except InvalidHomeworksError as error:
+                skipped = error.errors
+        notified = notify_changes(bot, subscription, state, changed)
+        received = response.items
+        current_date = response.fields.get("current_date")
+    else:
+        with SPANS.span("validate"):
+            homeworks, skipped = check_homeworks(response)
+        notified = notify_changes(bot, subscription, state, homeworks)
+        received = len(homeworks) + len(skipped)
+        current_date = response["current_date"] if received else None
+    if not notified:
+        logger.debug("Новых статусов нет")
+        state.idle_polls += 1
+    else:
+        state.idle_polls = 0
+    if received:
+        state.from_date = current_date
+    for error in skipped:
+        report_error(bot, subscription, state, error)
+    return not skipped
+
+
+def check_homeworks(
+    response: Optional[Dict],
+) -> Tuple[List[Homework], List[Exception]]:
+    """Возвращает корректные записи ответа и ошибки остальных записей."""
+    if response is None:
+        return [], []
+    try:
+        return check_response(response), []
+    except InvalidHomeworksError as error:
+        return error.homeworks, error.errors
+
+
+def notify_changes(
+    bot: telegram.Bot,
+    subscription: Subscription,
+    state: PollState,
+    homeworks: Iterable[Homework],
+) -> int:
+    """Сообщает о работах с новым статусом и возвращает их число."""
+    notified = 0
+    for homework in detect_changes(homeworks, state.statuses):
+        with SPANS.span("parse"):
+            message = parse_status(homework)
+        notify(bot, subscription, message, homework)
+        state.statuses[homework.key] = homework.version
+        get_store().save_status(
+            subscription.key, homework.key, *homework.version
+        )
+        notified += 1
+    return notified
+
+
+def poll_subscription(
+    bot: telegram.Bot, subscription: Subscription, state: PollState
+) -> None:
+    """Опрашивает API по одной подписке и обрабатывает ответ."""
+    try:
+        response = fetch_statuses(
+            subscription.headers,
+            state.from_date,
+            state.validators,
+            STREAM_RESPONSES,
+        )
+        with state.lock:
+            complete = handle_response(bot, subscription, state, response)
+
+    except CircuitOpenError as error:
+        logger.warning(error)
+
+    except RETRYABLE_ERRORS as error:
+        state.validators.forget()
+        state.failures += 1
+        state.retry_after = getattr(error, "retry_after", None)
+        report_error(bot, subscription, state, error)
+
+    except Exception as error:
+        state.validators.forget()
+        report_error(bot, subscription, state, error)
+
+    else:
+        state.failures = 0
+        state.retry_after = None
+        if complete:
+            report_recovery(bot, subscription, state)
+        else:
+            state.validators.forget()
+
+
+def webhook_source(
+    bot: telegram.Bot,
+    subscriptions: List[Subscription],
+    states: Dict[str, PollState],
+) -> WebhookSource:
+    """Создаёт приёмник push-запросов с ответами API."""
+
+    def handle_push(subscription: Subscription, response: Dict) -> None:
+        state = states[subscription.key]
+        with state.lock:
+            handle_response(bot, subscription, state, response)
+
+    return WebhookSource(
+        WEBHOOK_HOST,
+        WEBHOOK_PORT,
+        subscriptions,
+        PROFILER.profiled(handle_push),
+        WEBHOOK_SECRET,
+    )
+
+
+def poll_all(
+    bot: telegram.Bot,
+    subscriptions: List[Subscription],
+    states: Dict[str, PollState],
+    engine: Optional[AsyncPollingEngine] = None,
+    stopped: Optional[Callable[[], bool]] = None,
+) -> None:
+    """Информация о функции.
+    Опрашивает все подписки последовательно или через async-движок.
+    Если `stopped` вернул True, оставшиеся подписки раунда пропускаются,
+    чтобы остановка не ждала опроса каждой из них.
+    """
+    if engine is not None:
+        engine.run_round(bot, subscriptions, states, stopped)
+        return
+    for subscription in subscriptions:
+        if stopped is not None and stopped():
+            logger.info("Раунд опроса прерван остановкой")
+            return
+        poll_subscription(bot, subscription, states[subscription.key])
+
+
+def start_delivery(bot: telegram.Bot) -> DeliveryQueue:
+    """Запускает фоновую очередь отправки сообщений."""
+    from delivery import DeliveryQueue
+
+    global _delivery
+    _delivery = DeliveryQueue(
+        PROFILER.profiled(bot.send_message),
+        chat_interval=TELEGRAM_CHAT_INTERVAL,
+        global_rate=TELEGRAM_GLOBAL_RATE / max(SHARD_COUNT, 1),
+    )
+    metrics.QUEUE_DEPTH.set_function(_delivery.size)
+    return _delivery
+
+
+def start_digest(
+    bot: telegram.Bot, subscriptions: Optional[List[Subscription]] = None
+) -> DigestBuffer:
+    """Информация о функции.
+    Включает режим сводок вместо отправки каждого изменения.
+    Заголовок сводки пишется на языке, выбранном для чата в подписке.
+    При SHARD_COUNT > 1 из хранилища загружаются только сводки
+    переданных подписок, а бот без шардов загружает все, включая
+    записи без подписки, сохранённые до её учёта.
+    """
+    from digest import DigestBuffer
+
+    global _digest
+    preferences: Dict[str, ChatPreference] = {}
+    for subscription in subscriptions or ():
+        for chat_id in subscription.chat_ids:
+            preferences.setdefault(chat_id, subscription.preference(chat_id))
+    keys = None
+    if subscriptions is not None and SHARD_COUNT > 1:
+        keys = {subscription.key for subscription in subscriptions}
+    _digest = DigestBuffer(
+        lambda chat_id, message: send_digest(bot, chat_id, message),
+        DIGEST_WINDOW,
+        get_store(),
+        lambda chat_id, count: RENDERER.digest_header(
+            count, preferences.get(chat_id, ChatPreference())
+        ),
+        keys,
+    )
+    return _digest
+
+
+def check_config() -> bool:
+    """Информация о функции.
+    Проверяет конфигурацию бота без импорта Telegram
+    и без запросов к API.
+    """
+    if not check_tokens():
+        logger.critical(f"Отсутствуют токены {missing_tokens()}")
+        return False
+    if STATUS_SOURCE not in STATUS_SOURCES:
+        logger.critical(
+            f"Неизвестный источник статусов STATUS_SOURCE={STATUS_SOURCE}, "
+            f"допустимые значения: {', '.join(STATUS_SOURCES)}"
+        )
+        return False
+    if SHARD_WORKERS > 1 and STATUS_SOURCE != "poll":
+        logger.critical(
+            "Приём push-запросов не поддерживается при SHARD_WORKERS > 1: "
+            "ретранслятор не знает, какой процесс владеет токеном"
+        )
+        return False
+    try:
+        subscriptions = get_shard_subscriptions()
+    except (OSError, ValueError, TypeError) as error:
+        logger.critical(f"Не удается прочитать подписки: {error}")
+        return False
+    logger.info(f"Конфигурация в порядке, подписок: {len(subscriptions)}")
+    return True
+
+
+def load_states(
+    subscriptions: List[Subscription], store: StateStore
+) -> Dict[str, PollState]:
+    """Восстанавливает состояние опроса подписок из хранилища."""
+    cursors = store.load_cursors()
+    default_from_date = int(time.time()) - ONE_DAY
+    states = {}
+    for subscription in subscriptions:
+        state = PollState(cursors.get(subscription.key, default_from_date))
+        state.statuses = store.load_statuses(subscription.key)
+        states[subscription.key] = state
+    return states
 
 
 def missing_tokens() -> List:
@@ -127,31 +811,226 @@ def missing_tokens() -> List:
     return [i for i in tokens if not i]
 
 
+def start_services(
+    bot: telegram.Bot, subscriptions: List[Subscription]
+) -> None:
+    """Запускает включённые в настройках очередь отправки и сводки."""
+    if DELIVERY_QUEUE:
+        start_delivery(bot)
+    if DIGEST_WINDOW:
+        start_digest(bot, subscriptions)
+
+
+def start_sources(
+    bot: telegram.Bot,
+    subscriptions: List[Subscription],
+    states: Dict[str, PollState],
+    scheduler: PollScheduler,
+    engine: Optional[AsyncPollingEngine] = None,
+    stopped: Optional[Callable[[], bool]] = None,
+) -> List[StatusSource]:
+    """Информация о функции.
+    Запускает источники ответов API, выбранные в STATUS_SOURCE:
+    опрос, приём push-запросов или оба сразу. `stopped` прерывает
+    начатый раунд опроса при остановке.
+    """
+    sources: List[StatusSource] = []
+    if STATUS_SOURCE in ("poll", "both"):
+        sources.append(PollingSource(
+            subscriptions,
+            states,
+            scheduler,
+            lambda due: poll_all(bot, due, states, engine, stopped),
+        ))
+    if STATUS_SOURCE in ("webhook", "both"):
+        sources.append(webhook_source(bot, subscriptions, states))
+    for source in sources:
+        source.start()
+    return sources
+
+
+def run_sources(sources: List[StatusSource]) -> float:
+    """Выполняет раунд всех источников и возвращает паузу до следующего."""
+    delays = [source.run_round() for source in sources]
+    return min(
+        (delay for delay in delays if delay is not None),
+        default=RETRY_PERIOD,
+    )
+
+
+def register_shutdown(
+    shutdown: ShutdownCoordinator,
+    engine: Optional[AsyncPollingEngine],
+    sources: List[StatusSource],
+    states: Dict[str, PollState],
+) -> None:
+    """Информация о функции.
+    Задаёт порядок остановки: остановить источники ответов API,
+    дождаться начатых опросов, сохранить курсоры, дослать сообщения
+    из очереди и закрыть хранилище.
+    """
+    for source in sources:
+        shutdown.on_shutdown(
+            source.name, lambda timeout, stop=source.stop: stop()
+        )
+    if engine is not None:
+        shutdown.on_shutdown("engine", lambda timeout: engine.close())
+    shutdown.on_shutdown("cursors", lambda timeout: save_cursors(states))
+    shutdown.on_shutdown("profile", lambda timeout: PROFILER.stop())
+    if _delivery is not None:
+        shutdown.on_shutdown("delivery", _delivery.close)
+    shutdown.on_shutdown("store", lambda timeout: get_store().close())
+
+
+def save_cursors(states: Dict[str, PollState]) -> None:
+    """Сохраняет курсоры опроса всех подписок."""
+    get_store().save_cursors(
+        {key: state.from_date for key, state in states.items()}
+    )
+
+
+def start_profiler() -> ProfileDumper:
+    """Информация о функции.
+    Готовит снятие профиля по SIGUSR1, а с PROFILE_ON_START
+    запрашивает его сразу при запуске.
+    """
+    PROFILER.install()
+    if PROFILE_ON_START:
+        PROFILER.request()
+    return PROFILER
+
+
 def main() -> NoReturn:
     """Основная логика работы бота."""
     logger.debug("Основная логика работы бота.")
-    if not check_tokens():
-        logger.critical(f"Отсутствуют токены {missing_tokens()}")
-        sys.exit("Отсутствуют токены")
+    if not check_config():
+        sys.exit("Некорректная конфигурация")
+
+    subscriptions = get_shard_subscriptions()
+    store = get_store()
+    states = load_states(subscriptions, store)
+    logger.info(f"Загружено подписок: {len(subscriptions)}")
+    engine = None
+    if POLLING_ENGINE == "async":
+        from engine import AsyncPollingEngine
+
+        engine = AsyncPollingEngine(
+            PROFILER.profiled(poll_subscription), API_CONCURRENCY
+        )
+    scheduler = PollScheduler(
+        RETRY_PERIOD,
+        retry_policy=RetryPolicy(RETRY_BASE, RETRY_CAP),
+        adaptive=ADAPTIVE_POLLING,
+        min_interval=POLL_MIN_INTERVAL,
+        max_interval=POLL_MAX_INTERVAL,
+        reviewing_interval=POLL_REVIEWING_INTERVAL,
+        jitter=POLL_JITTER,
+    )
+    if METRICS_PORT:
+        metrics.start_server(METRICS_HOST, METRICS_PORT)
+    import telegram
 
-    previous_message = ""
     bot = telegram.Bot(token=TELEGRAM_TOKEN)
-    while True:
-        try:
-            timestamp = int(time.time()) - ONE_DAY
-            response = get_api_answer(timestamp)
-            message = parse_status(check_response(response))
+    shutdown = ShutdownCoordinator(SHUTDOWN_TIMEOUT)
+    shutdown.install()
+    profiler = start_profiler()
+    start_services(bot, subscriptions)
+    sources = start_sources(
+        bot,
+        subscriptions,
+        states,
+        scheduler,
+        engine,
+        lambda: shutdown.requested,
+    )
+    register_shutdown(shutdown, engine, sources, states)
+    while not shutdown.requested:
+        with SPANS.span("iteration"):
+            delay = run_sources(sources)
+            save_cursors(states)
+            if _digest is not None:
+                _digest.flush_due()
+        profiler.poll()
+        sleep_started = time.monotonic()
+        if not shutdown.sleep(delay):
+            SPANS.add(
+                "sleep_drift",
+                max(time.monotonic() - sleep_started - delay, 0),
+            )
+        SPANS.flush()
+    shutdown.drain()
+    sys.exit(0)
+
 
-        except Exception as error:
-            logging.error(error)
-            message = f"Сбой в работе программы: {error}"
+def run_shard(index: int, count: int) -> NoReturn:
+    """Информация о функции.
+    Запускает бота как шард `index` из `count`. Шарды работают на одной
+    машине, поэтому эндпоинт метрик шарда слушает METRICS_PORT + index.
+    """
+    global SHARD_INDEX, SHARD_COUNT, METRICS_PORT
+    SHARD_INDEX, SHARD_COUNT = str(index), count
+    if METRICS_PORT:
+        METRICS_PORT += index
+    main()
 
-        finally:
-            if message != previous_message:
-                send_message(bot, message)
-                previous_message = message
-            time.sleep(RETRY_PERIOD)
+
+def supervise(workers: int) -> NoReturn:
+    """Информация о функции.
+    Запускает `workers` процессов бота, каждый со своей частью
+    подписок, и перезапускает процессы, завершившиеся с ошибкой.
+    По SIGTERM пересылает сигнал шардам и ждёт их остановки.
+    """
+    import multiprocessing
+
+    context = multiprocessing.get_context("spawn")
+    shutdown = ShutdownCoordinator(SHUTDOWN_TIMEOUT)
+    shutdown.install()
+    processes = {}
+    while not shutdown.requested:
+        for index in range(workers):
+            process = processes.get(index)
+            if process is not None and (
+                process.is_alive() or process.exitcode == 0
+            ):
+                continue
+            if process is not None:
+                logger.error(
+                    f"Шард {index} завершился с кодом {process.exitcode}, "
+                    "перезапускаем"
+                )
+            processes[index] = context.Process(
+                target=run_shard,
+                args=(index, workers),
+                name=f"shard-{index}",
+                daemon=True,
+            )
+            processes[index].start()
+        shutdown.sleep(SUPERVISE_INTERVAL)
+    stop_shards(list(processes.values()), SHUTDOWN_TIMEOUT)
+    sys.exit(0)
+
+
+def stop_shards(processes: List, timeout: float) -> None:
+    """Информация о функции.
+    Пересылает шардам сигнал остановки и ждёт их завершения не дольше
+    `timeout` секунд, после чего завершает оставшиеся принудительно.
+    """
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+    deadline = time.monotonic() + timeout
+    for process in processes:
+        process.join(max(deadline - time.monotonic(), 0))
+        if process.is_alive():
+            logger.error(f"Шард {process.name} не остановился вовремя")
+            process.kill()
 
 
 if __name__ == "__main__":
+    if "--check" in sys.argv[1:]:
+        sys.exit(0 if check_config() else 1)
+    if SHARD_WORKERS > 1:
+        if not check_config():
+            sys.exit(1)
+        supervise(SHARD_WORKERS)
     main()
@@ -0,0 +1,77 @@
+"""Неблокирующая настройка логирования бота."""
+import atexit
+import json
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional, TextIO
+
+TEXT_FORMAT = (
+    "%(asctime)s - %(module)s - %(lineno)d - %(name)s - %(levelname)s "
+    "- %(message)s"
+)
+
+THIRD_PARTY_LOGGERS = ("telegram", "urllib3", "requests", "asyncio")
+DEFAULT_LEVEL = "DEBUG"
+
+_listener: Optional[QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Форматирует запись лога одной строкой JSON."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Возвращает запись в виде JSON-объекта."""
+        payload = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "line": record.lineno,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False)
+
+
+def setup_logging(
+    level: str, log_format: str, stream: TextIO = sys.stdout
+) -> QueueListener:
+    """Информация о функции.
+    Подключает к корневому логгеру QueueHandler, а запись в поток
+    выполняет QueueListener в отдельном потоке, поэтому форматирование
+    и ввод-вывод не задерживают опрос API. Уровень `level` задаётся
+    логгерам бота, а сторонние библиотеки пишут только предупреждения,
+    чтобы запросы Telegram и соединения urllib3 не попадали в лог.
+    Неизвестный уровень заменяется на DEFAULT_LEVEL с предупреждением.
+    Повторный вызов возвращает уже запущенный слушатель.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+    handler = logging.StreamHandler(stream)
+    if log_format == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    records = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.addHandler(QueueHandler(records))
+    known = isinstance(logging.getLevelName(level.upper()), int)
+    root.setLevel(level.upper() if known else DEFAULT_LEVEL)
+    for name in THIRD_PARTY_LOGGERS:
+        logging.getLogger(name).setLevel(
+            max(logging.WARNING, root.getEffectiveLevel())
+        )
+    _listener = QueueListener(records, handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+    if not known:
+        logging.getLogger(__name__).warning(
+            f"Неизвестный уровень логирования {level}, "
+            f"используется {DEFAULT_LEVEL}"
+        )
+    return _listener
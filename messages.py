@@ -0,0 +1,109 @@
+"""Шаблоны уведомлений о статусах работ на разных языках."""
+from typing import TYPE_CHECKING, Callable, Dict, List, NamedTuple, Tuple
+
+if TYPE_CHECKING:
+    from schema import Homework
+
+DEFAULT_LOCALE = "ru"
+SHORT = "short"
+FULL = "full"
+
+HEADLINES = {
+    "ru": 'Изменился статус проверки работы "{homework_name}". {verdict}',
+    "en": 'Review status of "{homework_name}" has changed. {verdict}',
+}
+DETAILS = {
+    "ru": (
+        ("reviewer_comment", "Комментарий ревьюера: {}"),
+        ("date_updated", "Обновлено: {}"),
+    ),
+    "en": (
+        ("reviewer_comment", "Reviewer comment: {}"),
+        ("date_updated", "Updated: {}"),
+    ),
+}
+DIGEST_HEADERS = {
+    "ru": "Изменения статусов работ: {count}",
+    "en": "Homework status changes: {count}",
+}
+VERDICTS = {
+    "en": {
+        "approved": "The reviewer approved the work. Hooray!",
+        "reviewing": "The work is being reviewed.",
+        "rejected": "The reviewer has left some remarks.",
+    },
+}
+
+
+class ChatPreference(NamedTuple):
+    """Язык и подробность уведомлений для одного чата."""
+
+    locale: str = DEFAULT_LOCALE
+    verbosity: str = SHORT
+
+
+class CompiledTemplate(NamedTuple):
+    """Шаблон с подставленным вердиктом и строки подробностей."""
+
+    headline: Callable[..., str]
+    details: Tuple[Tuple[str, Callable[..., str]], ...]
+
+
+class MessageRenderer:
+    """Информация о классе.
+    Собирает текст уведомления о работе. Вердикт подставляется
+    в шаблон один раз при компиляции, скомпилированные шаблоны
+    кешируются по (статус, язык, подробность), так что при отправке
+    остаётся только подставить поля работы.
+    """
+
+    def __init__(self, verdicts: Dict[str, Dict[str, str]]) -> None:
+        self.verdicts = verdicts
+        self.compiled: Dict[Tuple[str, str, str], CompiledTemplate] = {}
+
+    def compile(
+        self, status: str, locale: str, verbosity: str
+    ) -> CompiledTemplate:
+        """Возвращает шаблон из кеша, компилируя его при первом вызове."""
+        key = (status, locale, verbosity)
+        template = self.compiled.get(key)
+        if template is None:
+            verdict = self.verdicts[locale][status]
+            escaped = verdict.replace("{", "{{").replace("}", "}}")
+            headline = HEADLINES[locale].replace("{verdict}", escaped)
+            details = DETAILS[locale] if verbosity == FULL else ()
+            template = self.compiled[key] = CompiledTemplate(
+                headline.format,
+                tuple((field, line.format) for field, line in details),
+            )
+        return template
+
+    def digest_header(
+        self, count: int, preference: ChatPreference = ChatPreference()
+    ) -> str:
+        """Возвращает заголовок сводки из `count` изменений для чата."""
+        header = DIGEST_HEADERS.get(
+            preference.locale, DIGEST_HEADERS[DEFAULT_LOCALE]
+        )
+        return header.format(count=count)
+
+    def render(
+        self,
+        homework: "Homework",
+        preference: ChatPreference = ChatPreference(),
+    ) -> str:
+        """Возвращает текст уведомления о работе для настроек чата."""
+        locale = preference.locale
+        if locale not in self.verdicts:
+            locale = DEFAULT_LOCALE
+        template = self.compile(
+            homework.status, locale, preference.verbosity
+        )
+        lines: List[str] = [
+            template.headline(homework_name=homework.homework_name)
+        ]
+        for field, line in template.details:
+            value = getattr(homework, field)
+            if value:
+                lines.append(line(value))
+        return "\n".join(lines)
@@ -0,0 +1,249 @@
+"""Метрики бота в текстовом формате Prometheus."""
+import bisect
+import threading
+import time
+from contextlib import ContextDecorator
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+DEFAULT_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30
+)
+
+
+def format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    """Форматирует метки в виде {name="value",...}."""
+    if not labels:
+        return ""
+    pairs = ",".join(f'{name}="{value}"' for name, value in labels)
+    return f"{{{pairs}}}"
+
+
+class Metric:
+    """Базовая метрика: имя, описание и значения по наборам меток."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.lock = threading.Lock()
+        self.values: Dict[Tuple[Tuple[str, str], ...], float] = {}
+        REGISTRY.register(self)
+
+    def samples(self) -> List[str]:
+        """Возвращает строки значений метрики."""
+        with self.lock:
+            return [
+                f"{self.name}{format_labels(labels)} {value}"
+                for labels, value in sorted(self.values.items())
+            ]
+
+    def render(self) -> str:
+        """Возвращает метрику в текстовом формате Prometheus."""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+            *self.samples(),
+        ]
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Монотонно растущий счётчик."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """Увеличивает счётчик для набора меток."""
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        """Возвращает текущее значение счётчика."""
+        with self.lock:
+            return self.values.get(tuple(sorted(labels.items())), 0)
+
+
+class Gauge(Metric):
+    """Мгновенное значение, вычисляемое при каждом чтении."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str) -> None:
+        super().__init__(name, documentation)
+        self.function: Optional[Callable[[], float]] = None
+
+    def set_function(self, function: Optional[Callable[[], float]]) -> None:
+        """Задаёт функцию, возвращающую значение метрики."""
+        self.function = function
+
+    def samples(self) -> List[str]:
+        """Возвращает текущее значение, если функция задана."""
+        if self.function is None:
+            return []
+        return [f"{self.name} {self.function()}"]
+
+
+class Timer(ContextDecorator):
+    """Замеряет время блока или функции и записывает его в гистограмму."""
+
+    def __init__(self, histogram: "Histogram", labels: Dict) -> None:
+        self.histogram = histogram
+        self.labels = labels
+        self.started = 0.0
+
+    def _recreate_cm(self) -> "Timer":
+        return Timer(self.histogram, self.labels)
+
+    def __enter__(self) -> "Timer":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self.histogram.observe(
+            time.perf_counter() - self.started, **self.labels
+        )
+        return False
+
+
+class Histogram(Metric):
+    """Распределение длительностей по корзинам."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation)
+        self.buckets = buckets
+        self.counts: Dict[Tuple, List[int]] = {}
+        self.sums: Dict[Tuple, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Записывает одно наблюдение."""
+        key = tuple(sorted(labels.items()))
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            counts = self.counts.setdefault(key, [0] * len(self.buckets))
+            if index < len(counts):
+                counts[index] += 1
+            self.sums[key] = self.sums.get(key, 0) + value
+            self.values[key] = self.values.get(key, 0) + 1
+
+    def time(self, **labels: str) -> Timer:
+        """Возвращает таймер для `with` или декоратора."""
+        return Timer(self, labels)
+
+    def samples(self) -> List[str]:
+        """Возвращает корзины, сумму и число наблюдений."""
+        lines = []
+        with self.lock:
+            for key in sorted(self.values):
+                cumulative = 0
+                for bound, count in zip(self.buckets, self.counts[key]):
+                    cumulative += count
+                    labels = format_labels(key + (("le", str(bound)),))
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = format_labels(key + (("le", "+Inf"),))
+                lines.append(
+                    f"{self.name}_bucket{labels} {self.values[key]}"
+                )
+                labels = format_labels(key)
+                lines.append(f"{self.name}_sum{labels} {self.sums[key]}")
+                lines.append(f"{self.name}_count{labels} {self.values[key]}")
+        return lines
+
+
+class Registry:
+    """Набор метрик, отдаваемых эндпоинтом."""
+
+    def __init__(self) -> None:
+        self.metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> None:
+        """Добавляет метрику в реестр."""
+        self.metrics.append(metric)
+
+    def render(self) -> str:
+        """Возвращает все метрики в текстовом формате Prometheus."""
+        return "\n".join(metric.render() for metric in self.metrics) + "\n"
+
+
+REGISTRY = Registry()
+
+API_REQUEST_SECONDS = Histogram(
+    "homework_api_request_seconds", "Длительность запроса к API Практикума."
+)
+API_RESPONSES = Counter(
+    "homework_api_responses_total", "Ответы API Практикума по коду статуса."
+)
+CHECK_RESPONSE_SECONDS = Histogram(
+    "homework_check_response_seconds", "Длительность проверки ответа API."
+)
+PARSE_STATUS_SECONDS = Histogram(
+    "homework_parse_status_seconds", "Длительность разбора статуса работы."
+)
+DEDUP_HITS = Counter(
+    "homework_dedup_hits_total",
+    "Работы и ответы API, не изменившиеся с прошлого опроса.",
+)
+ERROR_REPORTS = Counter(
+    "homework_error_reports_total",
+    "Сбои по виду ошибки: отправленные и подавленные уведомления.",
+)
+SEND_SECONDS = Histogram(
+    "homework_send_seconds", "Длительность отправки сообщения в Telegram."
+)
+MESSAGE_EDITS = Counter(
+    "homework_message_edits_total",
+    "Сообщения о работах, обновлённые вместо отправки новых.",
+)
+SEND_FAILURES = Counter(
+    "homework_send_failures_total", "Неудачные отправки в Telegram."
+)
+PROXY_REQUESTS = Counter(
+    "homework_proxy_requests_total",
+    "Запросы к прокси API: из кеша, объединённые и переданные в API.",
+)
+STAGE_SECONDS = Histogram(
+    "homework_stage_seconds",
+    "Время этапов одной итерации основного цикла.",
+)
+QUEUE_DEPTH = Gauge(
+    "homework_delivery_queue_depth", "Сообщения, ожидающие отправки."
+)
+
+
+def start_server(host: str, port: int) -> "ThreadingHTTPServer":
+    """Запускает HTTP-эндпоинт /metrics в фоновом потоке."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(HTTPStatus.NOT_FOUND)
+                return
+            body = REGISTRY.render().encode()
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(
+        target=server.serve_forever, name="metrics", daemon=True
+    ).start()
+    return server
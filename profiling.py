@@ -0,0 +1,211 @@
+"""Замеры этапов итерации и снимки профиля работающего процесса."""
+import cProfile
+import functools
+import logging
+import os
+import pstats
+import signal
+import threading
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+PROFILE_SIGNAL = getattr(signal, "SIGUSR1", None)
+
+
+class Span:
+    """Замеряет время блока и добавляет его к этапу итерации."""
+
+    __slots__ = ("recorder", "stage", "started")
+
+    def __init__(self, recorder: "SpanRecorder", stage: str) -> None:
+        self.recorder = recorder
+        self.stage = stage
+        self.started = 0.0
+
+    def __enter__(self) -> "Span":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self.recorder.add(self.stage, time.perf_counter() - self.started)
+        return False
+
+
+class NullSpan:
+    """Пустой замер, когда запись этапов выключена."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "NullSpan":
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+NULL_SPAN = NullSpan()
+
+
+class SpanRecorder:
+    """Информация о классе.
+    Суммирует время этапов одной итерации основного цикла: запрос,
+    проверка, разбор, сравнение статусов, отправка и отклонение паузы
+    от заданной. По окончании итерации суммы пишутся в лог и в
+    гистограмму homework_stage_seconds.
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.totals: Dict[str, float] = {}
+
+    def span(self, stage: str):
+        """Возвращает контекстный менеджер замера этапа."""
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, stage)
+
+    def add(self, stage: str, seconds: float) -> None:
+        """Добавляет время к этапу текущей итерации."""
+        if not self.enabled:
+            return
+        with self.lock:
+            self.totals[stage] = self.totals.get(stage, 0) + seconds
+
+    def flush(self) -> Dict[str, float]:
+        """Завершает итерацию и возвращает суммы по этапам."""
+        with self.lock:
+            totals, self.totals = self.totals, {}
+        if totals:
+            for stage, seconds in totals.items():
+                metrics.STAGE_SECONDS.observe(max(seconds, 0), stage=stage)
+            summary = ", ".join(
+                f"{stage}={seconds * 1000:.1f}мс"
+                for stage, seconds in totals.items()
+            )
+            logger.debug(f"Этапы итерации: {summary}")
+        return totals
+
+
+class ProfileDumper:
+    """Информация о классе.
+    По сигналу SIGUSR1 или при запуске включает cProfile для потока
+    основного цикла и трассировку памяти, а через `duration` секунд
+    сохраняет в `directory` статистику профиля и снимок tracemalloc.
+    Функции, выполняемые в других потоках (пул опроса, очередь
+    отправки, приём push), профилируются через обёртку `profiled`:
+    каждый вызов получает свой профиль, и при сохранении все профили
+    объединяются. Запуск и сохранение выполняются в основном цикле
+    через `poll`, обработчик сигнала только ставит флаг.
+    """
+
+    def __init__(self, directory: str, duration: float = 60) -> None:
+        self.directory = directory
+        self.duration = duration
+        self.requested = False
+        self.profile: Optional[cProfile.Profile] = None
+        self.thread: Optional[threading.Thread] = None
+        self.lock = threading.Lock()
+        self.task_profiles: List[cProfile.Profile] = []
+        self.started = 0.0
+
+    def install(self, signum: Optional[int] = PROFILE_SIGNAL) -> None:
+        """Назначает обработчик сигнала снятия профиля, если он есть."""
+        if signum is None:
+            logger.info("Снятие профиля по сигналу недоступно")
+            return
+        signal.signal(signum, self.request)
+
+    def request(self, signum: Optional[int] = None, frame=None) -> None:
+        """Запрашивает снятие профиля."""
+        self.requested = True
+
+    def poll(self) -> Optional[str]:
+        """Информация о функции.
+        Начинает запрошенное профилирование или сохраняет завершённое.
+        Возвращает префикс путей сохранённых файлов.
+        """
+        if self.profile is not None:
+            if time.monotonic() - self.started >= self.duration:
+                return self.dump()
+            return None
+        if self.requested:
+            self.requested = False
+            self.start()
+        return None
+
+    def profiled(self, function: Callable) -> Callable:
+        """Информация о функции.
+        Оборачивает функцию, которая выполняется в другом потоке:
+        пока идёт профилирование, каждый её вызов профилируется.
+        С Python 3.12 профилировщики не работают одновременно, и вызов
+        выполняется без отдельного профиля.
+        """
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if (
+                self.profile is None
+                or threading.current_thread() is self.thread
+            ):
+                return function(*args, **kwargs)
+            profiles = self.task_profiles
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                return function(*args, **kwargs)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                profile.disable()
+                with self.lock:
+                    profiles.append(profile)
+
+        return wrapper
+
+    def start(self) -> None:
+        """Включает профилирование и трассировку памяти."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        with self.lock:
+            self.task_profiles = []
+        self.profile = cProfile.Profile()
+        self.thread = threading.current_thread()
+        self.started = time.monotonic()
+        self.profile.enable()
+        logger.info(f"Профилирование на {self.duration} с")
+
+    def stop(self) -> Optional[str]:
+        """Сохраняет начатое профилирование, например при остановке бота."""
+        if self.profile is None:
+            return None
+        return self.dump()
+
+    def dump(self) -> str:
+        """Останавливает профилирование и сохраняет результаты на диск."""
+        self.profile.disable()
+        os.makedirs(self.directory, exist_ok=True)
+        prefix = os.path.join(
+            self.directory,
+            f"{os.getpid()}-{time.strftime('%Y%m%d-%H%M%S')}",
+        )
+        stats = pstats.Stats(self.profile)
+        with self.lock:
+            task_profiles, self.task_profiles = self.task_profiles, []
+        for profile in task_profiles:
+            stats.add(profile)
+        stats.dump_stats(f"{prefix}.prof")
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        snapshot.dump(f"{prefix}.tracemalloc")
+        for stat in snapshot.statistics("lineno")[:10]:
+            logger.info(f"Память: {stat}")
+        self.profile = None
+        logger.info(f"Профиль сохранён: {prefix}.prof, {prefix}.tracemalloc")
+        return prefix
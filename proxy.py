@@ -0,0 +1,200 @@
+"""Информация о модуле.
+Кеширующий прокси к API Практикум.Домашка для нескольких экземпляров бота.
+
+Одинаковые одновременные запросы одного токена объединяются в один
+запрос к API, а успешные ответы отдаются из кеша в течение PROXY_TTL
+секунд. Боты подключаются к прокси через переменную ENDPOINT.
+
+Запуск:
+    python proxy.py
+
+Прокси слушает PROXY_HOST (по умолчанию 127.0.0.1), поэтому его нужно
+запускать на той же машине или в том же контейнере, что и боты.
+Отдельный процесс в Procfile для этого не подходит: dyno Heroku
+не видят сетевые порты друг друга.
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Callable, Dict, Tuple
+from urllib.parse import parse_qsl, urlparse
+
+from dotenv import load_dotenv
+
+import metrics
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+load_dotenv()
+
+PROXY_HOST = os.getenv("PROXY_HOST", "127.0.0.1")
+PROXY_PORT = int(os.getenv("PROXY_PORT", 8081))
+PROXY_TTL = float(os.getenv("PROXY_TTL", 30))
+PROXY_MAX_ENTRIES = int(os.getenv("PROXY_MAX_ENTRIES", 10000))
+PROXY_UPSTREAM = os.getenv(
+    "PROXY_UPSTREAM",
+    "https://practicum.yandex.ru/api/user_api/homework_statuses/",
+)
+PASSED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Retry-After")
+
+logger = logging.getLogger(__name__)
+
+Reply = Tuple[int, Dict[str, str], bytes]
+
+
+class CachingProxy:
+    """Информация о классе.
+    Объединяет одинаковые запросы, пришедшие одновременно, и кеширует
+    успешные ответы. Ключ запроса: заголовок Authorization и параметры.
+    Ответ выбирает первый пришедший запрос, остальные ждут его результат.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str, Tuple[Tuple[str, str], ...]], Reply],
+        ttl: float = 30,
+        max_entries: int = 10000,
+    ) -> None:
+        self.fetch = fetch
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.cache: Dict[Tuple, Tuple[float, Reply]] = {}
+        self.in_flight: Dict[Tuple, Future] = {}
+        self.lock = threading.Lock()
+
+    def get(
+        self, authorization: str, query: Tuple[Tuple[str, str], ...]
+    ) -> Reply:
+        """Возвращает ответ из кеша, общего запроса или API."""
+        key = (authorization, query)
+        with self.lock:
+            cached = self.cache.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                metrics.PROXY_REQUESTS.inc(result="hit")
+                return cached[1]
+            future = self.in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self.in_flight[key] = Future()
+        if not leader:
+            metrics.PROXY_REQUESTS.inc(result="coalesced")
+            return future.result()
+        metrics.PROXY_REQUESTS.inc(result="miss")
+        try:
+            reply = self.fetch(authorization, query)
+        except Exception as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(reply)
+            if reply[0] == HTTPStatus.OK:
+                self.store(key, reply)
+            return reply
+        finally:
+            with self.lock:
+                del self.in_flight[key]
+
+    def store(self, key: Tuple, reply: Reply) -> None:
+        """Кладёт ответ в кеш, вытесняя устаревшие записи."""
+        now = time.monotonic()
+        with self.lock:
+            if len(self.cache) >= self.max_entries:
+                self.cache = {
+                    cached_key: cached
+                    for cached_key, cached in self.cache.items()
+                    if cached[0] > now
+                }
+            if len(self.cache) >= self.max_entries:
+                self.cache.pop(next(iter(self.cache)))
+            self.cache[key] = (now + self.ttl, reply)
+
+
+def upstream_fetcher(
+    endpoint: str,
+) -> Callable[[str, Tuple[Tuple[str, str], ...]], Reply]:
+    """Возвращает функцию запроса к API через общий пул соединений."""
+    from client import PracticumClient
+
+    client = PracticumClient(endpoint)
+
+    def fetch(authorization: str, query: Tuple[Tuple[str, str], ...]) -> Reply:
+        response = client.get({"Authorization": authorization}, dict(query))
+        headers = {
+            name: response.headers[name]
+            for name in PASSED_HEADERS
+            if name in response.headers
+        }
+        return response.status_code, headers, response.content
+
+    return fetch
+
+
+def serve(proxy: CachingProxy, host: str, port: int) -> "ThreadingHTTPServer":
+    """Создаёт HTTP-сервер прокси, не запуская его."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == "/metrics":
+                body = metrics.REGISTRY.render().encode()
+                self.reply(HTTPStatus.OK, {"Content-Type": "text/plain"}, body)
+                return
+            query = tuple(sorted(parse_qsl(url.query)))
+            try:
+                status, headers, body = proxy.get(
+                    self.headers.get("Authorization", ""), query
+                )
+            except Exception as error:
+                logger.error(f"Ошибка при запросе к основному API: {error}")
+                self.reply(HTTPStatus.BAD_GATEWAY, {}, b"")
+                return
+            etag = headers.get("ETag")
+            if (
+                status == HTTPStatus.OK
+                and etag
+                and self.headers.get("If-None-Match") == etag
+            ):
+                self.reply(HTTPStatus.NOT_MODIFIED, headers, b"")
+                return
+            self.reply(status, headers, body)
+
+        def reply(self, status: int, headers: Dict, body: bytes) -> None:
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+def main() -> None:
+    """Запускает прокси с настройками из окружения."""
+    from logs import setup_logging
+
+    setup_logging(
+        os.getenv("LOG_LEVEL", "INFO"), os.getenv("LOG_FORMAT", "json")
+    )
+    proxy = CachingProxy(
+        upstream_fetcher(PROXY_UPSTREAM), PROXY_TTL, PROXY_MAX_ENTRIES
+    )
+    server = serve(proxy, PROXY_HOST, PROXY_PORT)
+    logger.info(f"Прокси API запущен на {PROXY_HOST}:{PROXY_PORT}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
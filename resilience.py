@@ -0,0 +1,93 @@
+"""Повторные попытки и автоматический выключатель запросов к API."""
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Разбирает заголовок Retry-After: число секунд или HTTP-дату."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(moment.timestamp() - time.time(), 0)
+
+
+class RetryPolicy:
+    """Информация о классе.
+    Экспоненциальная задержка с полным разбросом (full jitter):
+    пауза перед n-й повторной попыткой выбирается случайно
+    из [0, min(cap, base * 2 ** (n - 1))]. Retry-After сервера
+    задаёт нижнюю границу паузы.
+    """
+
+    def __init__(self, base: float, cap: float) -> None:
+        self.base = base
+        self.cap = cap
+
+    def delay(
+        self, attempt: int, retry_after: Optional[float] = None
+    ) -> float:
+        """Возвращает паузу перед повторной попыткой номер `attempt`."""
+        ceiling = min(self.cap, self.base * 2 ** min(attempt - 1, 32))
+        delay = random.uniform(0, ceiling)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+
+class CircuitBreaker:
+    """Информация о классе.
+    После `threshold` сбоев подряд размыкается и отклоняет запросы.
+    Через `reset_timeout` секунд пропускает один пробный запрос:
+    успех замыкает цепь, сбой снова размыкает её.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, threshold: int, reset_timeout: float) -> None:
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Разрешает ли выключатель очередной запрос."""
+        with self.lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and (
+                time.monotonic() - self.opened_at >= self.reset_timeout
+            ):
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Замыкает цепь после успешного запроса."""
+        with self.lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        """Учитывает сбой и при необходимости размыкает цепь."""
+        with self.lock:
+            self.failures += 1
+            if (
+                self.state == self.HALF_OPEN
+                or self.failures >= self.threshold
+            ):
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
@@ -0,0 +1,81 @@
+"""Планировщик опроса подписок."""
+import random
+import time
+from typing import Dict, List, Optional
+
+from resilience import RetryPolicy
+from subscriptions import PollState, Subscription
+
+
+class PollScheduler:
+    """Информация о классе.
+    Выбирает момент следующего опроса для каждой подписки.
+    В фиксированном режиме все подписки опрашиваются раз в `base`
+    секунд. В адаптивном режиме работы на ревью опрашиваются часто,
+    а при отсутствии изменений интервал растёт экспоненциально
+    в пределах [min_interval, max_interval] со случайным разбросом.
+    После сбоев запроса к API пауза выбирается политикой повторов;
+    в фиксированном режиме такая подписка пропускает раунды опроса,
+    пока пауза не истечёт.
+    """
+
+    def __init__(
+        self,
+        base: float,
+        adaptive: bool = False,
+        min_interval: float = 60,
+        max_interval: float = 6 * 60 * 60,
+        reviewing_interval: float = 120,
+        backoff: float = 2,
+        jitter: float = 0.1,
+        retry_policy: Optional[RetryPolicy] = None,
+    ) -> None:
+        self.base = base
+        self.retry_policy = retry_policy
+        self.adaptive = adaptive
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.reviewing_interval = reviewing_interval
+        self.backoff = backoff
+        self.jitter = jitter
+
+    def interval(self, state: PollState) -> float:
+        """Возвращает паузу до следующего опроса подписки."""
+        if not self.adaptive:
+            return self.base
+        if any(status == "reviewing" for status, _ in state.statuses.values()):
+            interval = self.reviewing_interval
+        else:
+            interval = self.base * self.backoff ** min(state.idle_polls, 16)
+        interval *= 1 + random.uniform(-self.jitter, self.jitter)
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def schedule(self, state: PollState) -> None:
+        """Назначает следующий опрос подписки после завершённого."""
+        now = time.monotonic()
+        if state.failures and self.retry_policy is not None:
+            state.next_poll_at = now + self.retry_policy.delay(
+                state.failures, state.retry_after
+            )
+        elif self.adaptive:
+            state.next_poll_at = now + self.interval(state)
+        else:
+            state.next_poll_at = now
+
+    def due(
+        self, subscriptions: List[Subscription], states: Dict[str, PollState]
+    ) -> List[Subscription]:
+        """Возвращает подписки, которые пора опросить."""
+        now = time.monotonic()
+        return [
+            subscription
+            for subscription in subscriptions
+            if states[subscription.key].next_poll_at <= now
+        ]
+
+    def delay(self, states: Dict[str, PollState]) -> float:
+        """Возвращает паузу до ближайшего запланированного опроса."""
+        if not self.adaptive or not states:
+            return self.base
+        next_poll_at = min(state.next_poll_at for state in states.values())
+        return max(next_poll_at - time.monotonic(), 0)
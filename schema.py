@@ -0,0 +1,143 @@
+"""Проверка ответа API и компактные записи о работах."""
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING, Container, Dict, Iterator, List, Optional, Tuple
+)
+
+from exceptions import (
+    InvalidHomeworksError,
+    KeyIsMissingError,
+    ProjStatusNotFoundError,
+    ResponseIsNotDictError,
+    ValueIsNotListError,
+)
+
+if TYPE_CHECKING:
+    from streaming import ResponseStream
+
+
+@dataclass(slots=True)
+class Homework:
+    """Проверенная запись о работе из ответа API."""
+
+    homework_name: str
+    status: str
+    id: Optional[int] = None
+    date_updated: Optional[str] = None
+    reviewer_comment: Optional[str] = None
+    lesson_name: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        """Идентификатор работы для сравнения статусов."""
+        return str(self.homework_name if self.id is None else self.id)
+
+    @property
+    def version(self) -> Tuple[str, Optional[str]]:
+        """Статус работы и время его последнего изменения."""
+        return self.status, self.date_updated
+
+
+def parse_homework(item: Dict, statuses: Container[str]) -> Homework:
+    """Проверяет одну запись о работе и возвращает её в виде Homework."""
+    if not isinstance(item, dict):
+        raise ResponseIsNotDictError(
+            f"Запись о работе не является словарем: {type(item)}"
+        )
+    get = item.get
+    homework_name = get("homework_name")
+    if homework_name is None:
+        raise KeyIsMissingError(
+            "Ключ homework_name отсутствует в ответе сервера"
+        )
+    status = get("status")
+    if status is None:
+        raise KeyIsMissingError("Ключ status отсутствует в ответе сервера")
+    if status not in statuses:
+        raise ProjStatusNotFoundError(
+            f"Неопределенный статус работы: {status}"
+        )
+    return Homework(
+        homework_name,
+        status,
+        get("id"),
+        get("date_updated"),
+        get("reviewer_comment"),
+        get("lesson_name"),
+    )
+
+
+def validate_response(
+    response: Dict, statuses: Container[str]
+) -> List[Homework]:
+    """Информация о функции.
+    Проверяет ответ API за один проход: структуру ответа, наличие
+    current_date и каждую запись о работе, включая известность
+    её статуса. Возвращает записи в виде Homework. Некорректные записи
+    не отменяют остальные: они собираются в InvalidHomeworksError
+    вместе с корректными записями.
+    """
+    if not isinstance(response, dict):
+        raise ResponseIsNotDictError(
+            f"Переменная {response} не является словарем."
+        )
+    homeworks = response.get("homeworks")
+    if homeworks is None:
+        raise KeyIsMissingError(
+            "Нет доступных значений в ответе сервера: homeworks"
+        )
+    if not response.get("current_date"):
+        raise KeyIsMissingError(
+            "Нет доступных значений в ответе сервера: current_date"
+        )
+    if not isinstance(homeworks, list):
+        raise ValueIsNotListError(
+            "В ответе API домашки под ключом `homeworks` данные приходят "
+            f"не в виде списка, {type(homeworks)}."
+        )
+    valid, errors = [], []
+    for item in homeworks:
+        try:
+            valid.append(parse_homework(item, statuses))
+        except (TypeError, KeyError, ProjStatusNotFoundError) as error:
+            errors.append(error)
+    if errors:
+        raise InvalidHomeworksError(errors, valid)
+    return valid
+
+
+def validate_stream(
+    stream: "ResponseStream", statuses: Container[str]
+) -> Iterator[Homework]:
+    """Информация о функции.
+    Проверяет ответ API, читаемый потоком: отдаёт записи о работах
+    по одной, а проверки ключей верхнего уровня выполняет после
+    того, как ответ прочитан до конца. Поэтому действовать по записям
+    можно только после того, как генератор исчерпан. Некорректные
+    записи пропускаются и в конце сообщаются одним
+    InvalidHomeworksError, уже отданные записи при этом верны.
+    """
+    errors = []
+    for item in stream.homeworks():
+        try:
+            homework = parse_homework(item, statuses)
+        except (TypeError, KeyError, ProjStatusNotFoundError) as error:
+            errors.append(error)
+        else:
+            yield homework
+    fields = stream.fields
+    if "homeworks" in fields:
+        raise ValueIsNotListError(
+            "В ответе API домашки под ключом `homeworks` данные приходят "
+            f"не в виде списка, {type(fields['homeworks'])}."
+        )
+    if not stream.has_homeworks:
+        raise KeyIsMissingError(
+            "Нет доступных значений в ответе сервера: homeworks"
+        )
+    if not fields.get("current_date"):
+        raise KeyIsMissingError(
+            "Нет доступных значений в ответе сервера: current_date"
+        )
+    if errors:
+        raise InvalidHomeworksError(errors)
@@ -0,0 +1,60 @@
+"""Распределение подписок между процессами по консистентному хешу."""
+import bisect
+import hashlib
+import re
+from typing import List, Optional
+
+from subscriptions import Subscription
+
+DYNO_PATTERN = re.compile(r"^[\w-]+\.(\d+)$")
+
+
+def point(value: str) -> int:
+    """Возвращает положение строки на кольце хешей."""
+    return int.from_bytes(hashlib.sha256(value.encode()).digest()[:8], "big")
+
+
+class HashRing:
+    """Информация о классе.
+    Кольцо консистентного хеширования: каждый шард занимает
+    `replicas` точек, подписка принадлежит шарду ближайшей точки
+    по часовой стрелке. При изменении числа шардов переезжает
+    только около 1/N подписок.
+    """
+
+    def __init__(self, shards: int, replicas: int = 128) -> None:
+        points = sorted(
+            (point(f"shard-{shard}-{replica}"), shard)
+            for shard in range(shards)
+            for replica in range(replicas)
+        )
+        self.hashes = [hash_ for hash_, _ in points]
+        self.shards = [shard for _, shard in points]
+
+    def owner(self, key: str) -> int:
+        """Возвращает номер шарда, которому принадлежит ключ."""
+        index = bisect.bisect(self.hashes, point(key)) % len(self.hashes)
+        return self.shards[index]
+
+
+def partition(
+    subscriptions: List[Subscription], shard: int, shards: int
+) -> List[Subscription]:
+    """Возвращает подписки, которые опрашивает шард `shard` из `shards`."""
+    ring = HashRing(shards)
+    return [
+        subscription
+        for subscription in subscriptions
+        if ring.owner(subscription.key) == shard
+    ]
+
+
+def shard_from_dyno(dyno: Optional[str]) -> Optional[int]:
+    """Информация о функции.
+    Вычисляет номер шарда по имени процесса Heroku вида `worker.3`:
+    процессы нумеруются с единицы, шарды с нуля.
+    """
+    match = DYNO_PATTERN.match(dyno or "")
+    if match is None:
+        return None
+    return int(match.group(1)) - 1
@@ -0,0 +1,63 @@
+"""Корректная остановка бота по сигналу."""
+import logging
+import signal
+import threading
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ShutdownCoordinator:
+    """Информация о классе.
+    По SIGTERM прерывает ожидание между опросами и по очереди
+    выполняет зарегистрированные шаги остановки: дожидается отправки
+    сообщений и сохраняет состояние, укладываясь в общий срок.
+    """
+
+    def __init__(self, timeout: float = 25) -> None:
+        self.timeout = timeout
+        self.event = threading.Event()
+        self.steps: List[Tuple[str, Callable[[float], Any]]] = []
+
+    @property
+    def requested(self) -> bool:
+        """Запрошена ли остановка."""
+        return self.event.is_set()
+
+    def install(self, signals: Tuple[int, ...] = (signal.SIGTERM,)) -> None:
+        """Назначает обработчик сигналов остановки."""
+        for signum in signals:
+            signal.signal(signum, self.request)
+
+    def request(
+        self, signum: Optional[int] = None, frame: Any = None
+    ) -> None:
+        """Запрашивает остановку, может вызываться из обработчика сигнала."""
+        if not self.requested:
+            logger.info("Получен сигнал остановки")
+        self.event.set()
+
+    def sleep(self, seconds: float) -> bool:
+        """Ждёт до следующего опроса, возвращает True при остановке."""
+        return self.event.wait(seconds)
+
+    def on_shutdown(self, name: str, step: Callable[[float], Any]) -> None:
+        """Добавляет шаг остановки, получающий оставшееся время."""
+        self.steps.append((name, step))
+
+    def drain(self) -> bool:
+        """Выполняет шаги остановки, возвращает успешность всех шагов."""
+        deadline = time.monotonic() + self.timeout
+        completed = True
+        for name, step in self.steps:
+            remaining = max(deadline - time.monotonic(), 0)
+            try:
+                if step(remaining) is False:
+                    completed = False
+                    logger.warning(f"Шаг остановки не завершён: {name}")
+            except Exception as error:
+                completed = False
+                logger.error(f"Ошибка при остановке ({name}): {error}")
+        logger.info("Бот остановлен")
+        return completed
@@ -0,0 +1,164 @@
+"""Источники ответов API: опрос Практикума или входящие push-запросы."""
+import hmac
+import json
+import logging
+import threading
+from abc import ABC, abstractmethod
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+from subscriptions import PollState, Subscription
+
+if TYPE_CHECKING:
+    from scheduler import PollScheduler
+
+logger = logging.getLogger(__name__)
+
+MAX_BODY_SIZE = 1024 * 1024
+
+
+class StatusSource(ABC):
+    """Информация о классе.
+    Источник ответов API для подписок. Каждый полученный ответ
+    источник передаёт на обработку сам: опрос вызывает функцию опроса
+    подписки, push-приёмник вызывает обработчик из своего потока.
+    Основной цикл вызывает `run_round` на каждой итерации.
+    """
+
+    name = "source"
+
+    @abstractmethod
+    def start(self) -> None:
+        """Начинает получать ответы API."""
+
+    @abstractmethod
+    def stop(self) -> None:
+        """Перестаёт получать ответы API."""
+
+    def run_round(self) -> Optional[float]:
+        """Информация о функции.
+        Выполняет работу источника в основном цикле и возвращает паузу
+        до следующего вызова. None означает, что источник работает
+        в фоне и основному циклу ждать его не нужно.
+        """
+        return None
+
+
+class PollingSource(StatusSource):
+    """Информация о классе.
+    Опрашивает API Практикума: на каждой итерации выбирает через
+    планировщик подписки, которые пора опросить, передаёт их функции
+    `poll` и назначает им следующий опрос.
+    """
+
+    name = "poll"
+
+    def __init__(
+        self,
+        subscriptions: List[Subscription],
+        states: Dict[str, PollState],
+        scheduler: "PollScheduler",
+        poll: Callable[[List[Subscription]], None],
+    ) -> None:
+        self.subscriptions = subscriptions
+        self.states = states
+        self.scheduler = scheduler
+        self.poll = poll
+
+    def start(self) -> None:
+        """Опросу не нужен фоновый поток."""
+
+    def stop(self) -> None:
+        """Начатый раунд опроса завершает основной цикл."""
+
+    def run_round(self) -> float:
+        """Опрашивает подписки, которым пора, и возвращает паузу."""
+        due = self.scheduler.due(self.subscriptions, self.states)
+        self.poll(due)
+        for subscription in due:
+            self.scheduler.schedule(self.states[subscription.key])
+        return self.scheduler.delay(self.states)
+
+
+class WebhookSource(StatusSource):
+    """Информация о классе.
+    Принимает POST-запросы с телом в формате ответа API Практикума
+    от внешнего ретранслятора. Подписка определяется по заголовку
+    `Authorization: OAuth <токен>`, как в самом API. Если задан секрет,
+    он проверяется по заголовку `X-Webhook-Secret`.
+    """
+
+    name = "webhook"
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        subscriptions: List[Subscription],
+        handler: Callable[[Subscription, Dict], None],
+        secret: Optional[str] = None,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.subscriptions = {
+            subscription.token: subscription for subscription in subscriptions
+        }
+        self.handler = handler
+        self.secret = secret
+        self.server = None
+
+    def authorize(self, headers) -> Optional[Subscription]:
+        """Возвращает подписку по заголовкам запроса."""
+        if self.secret and not hmac.compare_digest(
+            headers.get("X-Webhook-Secret", ""), self.secret
+        ):
+            return None
+        authorization = headers.get("Authorization", "")
+        if not authorization.startswith("OAuth "):
+            return None
+        return self.subscriptions.get(authorization[len("OAuth "):])
+
+    def receive(self, headers, body: bytes) -> int:
+        """Обрабатывает один push-запрос и возвращает HTTP-код ответа."""
+        subscription = self.authorize(headers)
+        if subscription is None:
+            return HTTPStatus.UNAUTHORIZED
+        try:
+            self.handler(subscription, json.loads(body))
+        except Exception as error:
+            logger.warning(f"Некорректный push-запрос: {error}")
+            return HTTPStatus.BAD_REQUEST
+        return HTTPStatus.NO_CONTENT
+
+    def start(self) -> None:
+        """Запускает HTTP-приёмник в фоновом потоке."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        source = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                if length > MAX_BODY_SIZE:
+                    self.send_error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+                    return
+                status = source.receive(self.headers, self.rfile.read(length))
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(
+            target=self.server.serve_forever, name="webhook", daemon=True
+        ).start()
+        logger.info(f"Приём push-запросов на {self.host}:{self.port}")
+
+    def stop(self) -> None:
+        """Останавливает HTTP-приёмник."""
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
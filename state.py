@@ -0,0 +1,177 @@
+"""Постоянное хранилище курсоров опроса и статусов работ."""
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cursors (
+    subscription TEXT PRIMARY KEY,
+    from_date INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS homeworks (
+    subscription TEXT NOT NULL,
+    homework_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    date_updated TEXT,
+    PRIMARY KEY (subscription, homework_id)
+);
+CREATE TABLE IF NOT EXISTS live_messages (
+    chat_id TEXT NOT NULL,
+    subscription TEXT NOT NULL,
+    homework_id TEXT NOT NULL,
+    message_id INTEGER NOT NULL,
+    PRIMARY KEY (chat_id, subscription, homework_id)
+);
+CREATE TABLE IF NOT EXISTS digests (
+    chat_id TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    message TEXT NOT NULL,
+    subscription TEXT NOT NULL DEFAULT ''
+);
+"""
+MIGRATIONS = (
+    (
+        "digests",
+        "subscription",
+        "ALTER TABLE digests "
+        "ADD COLUMN subscription TEXT NOT NULL DEFAULT ''",
+    ),
+)
+
+
+class StateStore:
+    """Информация о классе.
+    Хранит в SQLite курсор опроса каждой подписки и последний
+    увиденный статус каждой работы, чтобы после перезапуска
+    не отправлять уже известные статусы повторно.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+        self.migrate()
+
+    def migrate(self) -> None:
+        """Добавляет столбцы, появившиеся после создания базы."""
+        for table, column, statement in MIGRATIONS:
+            columns = {
+                row[1]
+                for row in self.connection.execute(
+                    f"PRAGMA table_info({table})"
+                )
+            }
+            if column not in columns:
+                with self.connection:
+                    self.connection.execute(statement)
+
+    def load_cursors(self) -> Dict[str, int]:
+        """Возвращает курсоры опроса по ключам подписок."""
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT subscription, from_date FROM cursors"
+            ).fetchall()
+        return dict(rows)
+
+    def save_cursors(self, cursors: Dict[str, int]) -> None:
+        """Сохраняет курсоры опроса одной транзакцией."""
+        with self.lock, self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO cursors VALUES (?, ?)",
+                cursors.items(),
+            )
+
+    def load_statuses(
+        self, subscription: str
+    ) -> Dict[str, Tuple[str, Optional[str]]]:
+        """Возвращает известные статусы работ подписки."""
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT homework_id, status, date_updated FROM homeworks "
+                "WHERE subscription = ?",
+                (subscription,),
+            ).fetchall()
+        return {
+            homework_id: (status, date_updated)
+            for homework_id, status, date_updated in rows
+        }
+
+    def save_status(
+        self,
+        subscription: str,
+        homework_id: str,
+        status: str,
+        date_updated: Optional[str],
+    ) -> None:
+        """Запоминает последний отправленный статус работы."""
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO homeworks VALUES (?, ?, ?, ?)",
+                (subscription, homework_id, status, date_updated),
+            )
+
+    def load_message_id(
+        self, chat_id: str, subscription: str, homework_id: str
+    ) -> Optional[int]:
+        """Возвращает идентификатор сообщения о работе в чате."""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT message_id FROM live_messages "
+                "WHERE chat_id = ? AND subscription = ? AND homework_id = ?",
+                (chat_id, subscription, homework_id),
+            ).fetchone()
+        return row[0] if row else None
+
+    def save_message_id(
+        self,
+        chat_id: str,
+        subscription: str,
+        homework_id: str,
+        message_id: int,
+    ) -> None:
+        """Запоминает сообщение, которое обновляется при смене статуса."""
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO live_messages VALUES (?, ?, ?, ?)",
+                (chat_id, subscription, homework_id, message_id),
+            )
+
+    def load_digests(self) -> List[Tuple[int, str, str, float, str]]:
+        """Информация о функции.
+        Возвращает неотправленные сообщения сводок в порядке поступления:
+        номер строки, подписку, чат, время и текст.
+        """
+        with self.lock:
+            return self.connection.execute(
+                "SELECT rowid, subscription, chat_id, created_at, message "
+                "FROM digests ORDER BY rowid"
+            ).fetchall()
+
+    def add_digest(
+        self,
+        subscription: str,
+        chat_id: str,
+        created_at: float,
+        message: str,
+    ) -> int:
+        """Добавляет сообщение в сводку чата и возвращает номер строки."""
+        with self.lock, self.connection:
+            return self.connection.execute(
+                "INSERT INTO digests (subscription, chat_id, created_at, "
+                "message) VALUES (?, ?, ?, ?)",
+                (subscription, chat_id, created_at, message),
+            ).lastrowid
+
+    def delete_digests(self, rowids: Iterable[int]) -> None:
+        """Удаляет отправленные сообщения сводок."""
+        with self.lock, self.connection:
+            self.connection.executemany(
+                "DELETE FROM digests WHERE rowid = ?",
+                ((rowid,) for rowid in rowids),
+            )
+
+    def close(self) -> None:
+        """Закрывает соединение с базой."""
+        with self.lock:
+            self.connection.close()
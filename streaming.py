@@ -0,0 +1,124 @@
+"""Потоковый разбор ответа API без загрузки всего тела в память."""
+import codecs
+import json
+import re
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from exceptions import ResponseIsNotDictError
+
+CHUNK_SIZE = 64 * 1024
+WHITESPACE = re.compile(r"\s*")
+
+
+class ResponseStream:
+    """Информация о классе.
+    Читает JSON-объект ответа API по частям. Элементы списка
+    `homeworks` отдаются по одному, прочитанная часть буфера
+    отбрасывается, поэтому память не растёт с размером ответа.
+    Остальные ключи верхнего уровня попадают в `fields`.
+    """
+
+    def __init__(
+        self,
+        chunks: Iterable[bytes],
+        close: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self.chunks = iter(chunks)
+        self.close = close or (lambda: None)
+        self.text = codecs.getincrementaldecoder("utf-8")()
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.position = 0
+        self.exhausted = False
+        self.fields: Dict[str, Any] = {}
+        self.has_homeworks = False
+        self.items = 0
+
+    def __enter__(self) -> "ResponseStream":
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self.close()
+        return False
+
+    def homeworks(self) -> Iterator[Any]:
+        """Отдаёт элементы `homeworks` по мере чтения ответа."""
+        if self._next() != "{":
+            raise ResponseIsNotDictError("Ответ API не является словарем.")
+        if self._peek() == "}":
+            self.position += 1
+            return
+        while True:
+            key = self._value()
+            if self._next() != ":":
+                raise ValueError("Некорректный JSON в ответе API")
+            if key == "homeworks" and self._peek() == "[":
+                self.position += 1
+                self.has_homeworks = True
+                yield from self._items()
+            else:
+                self.fields[key] = self._value()
+            separator = self._next()
+            if separator == "}":
+                return
+            if separator != ",":
+                raise ValueError("Некорректный JSON в ответе API")
+
+    def _items(self) -> Iterator[Any]:
+        if self._peek() == "]":
+            self.position += 1
+            return
+        while True:
+            yield self._value()
+            self.items += 1
+            self._compact()
+            separator = self._next()
+            if separator == "]":
+                return
+            if separator != ",":
+                raise ValueError("Некорректный JSON в ответе API")
+
+    def _fill(self) -> bool:
+        """Дочитывает следующую часть ответа, False в конце тела."""
+        for chunk in self.chunks:
+            if chunk:
+                self.buffer += self.text.decode(chunk)
+                return True
+        if not self.exhausted:
+            self.buffer += self.text.decode(b"", final=True)
+            self.exhausted = True
+        return False
+
+    def _compact(self) -> None:
+        """Отбрасывает разобранную часть буфера."""
+        if self.position > CHUNK_SIZE:
+            self.buffer = self.buffer[self.position:]
+            self.position = 0
+
+    def _peek(self) -> str:
+        while True:
+            self.position = WHITESPACE.match(self.buffer, self.position).end()
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self._fill():
+                raise ValueError("Ответ API оборвался")
+
+    def _next(self) -> str:
+        char = self._peek()
+        self.position += 1
+        return char
+
+    def _value(self) -> Any:
+        self._peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(
+                    self.buffer, self.position
+                )
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            if end < len(self.buffer) or not self._fill():
+                self.position = end
+                return value
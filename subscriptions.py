@@ -0,0 +1,108 @@
+"""Подписки: какие токены Практикума опрашивать и в какие чаты писать."""
+import hashlib
+import json
+import threading
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from client import ResponseValidators
+from messages import DEFAULT_LOCALE, SHORT, ChatPreference
+
+
+class Subscription(NamedTuple):
+    """Токен API Практикума и чаты Telegram, получающие его статусы."""
+
+    token: str
+    chat_ids: Tuple[str, ...]
+    preferences: Tuple[Tuple[str, ChatPreference], ...] = ()
+
+    @property
+    def key(self) -> str:
+        """Короткий идентификатор подписки, не раскрывающий токен."""
+        return hashlib.sha256(self.token.encode()).hexdigest()[:16]
+
+    @property
+    def headers(self) -> Dict:
+        """Заголовки запроса к API для этого токена."""
+        return {"Authorization": f"OAuth {self.token}"}
+
+    def preference(self, chat_id: str) -> ChatPreference:
+        """Настройки уведомлений чата, по умолчанию русский и кратко."""
+        for preference_chat_id, preference in self.preferences:
+            if preference_chat_id == chat_id:
+                return preference
+        return ChatPreference()
+
+
+class PollState:
+    """Состояние опроса одной подписки между итерациями."""
+
+    __slots__ = (
+        "from_date",
+        "error",
+        "error_reported",
+        "recovered_at",
+        "statuses",
+        "idle_polls",
+        "next_poll_at",
+        "failures",
+        "retry_after",
+        "validators",
+        "lock",
+    )
+
+    def __init__(self, from_date: int) -> None:
+        self.from_date = from_date
+        self.error: Optional[str] = None
+        self.error_reported: Dict[str, float] = {}
+        self.recovered_at = 0.0
+        self.idle_polls = 0
+        self.next_poll_at = 0.0
+        self.failures = 0
+        self.retry_after: Optional[float] = None
+        self.validators = ResponseValidators()
+        self.lock = threading.Lock()
+        self.statuses: Dict[str, Tuple[str, Optional[str]]] = {}
+
+
+def parse_subscriptions(raw: str) -> List[Subscription]:
+    """Информация о функции.
+    Разбирает JSON вида {"<токен>": ["<chat_id>", ...]}.
+    Вместо списка чатов допускается один идентификатор. Чат можно
+    задать объектом {"id": ..., "locale": "en", "verbosity": "full"},
+    чтобы выбрать язык и подробность уведомлений.
+    """
+    config = json.loads(raw)
+    if not isinstance(config, dict):
+        raise TypeError("Подписки должны быть словарем токен -> чаты.")
+    subscriptions = []
+    for token, chats in config.items():
+        if not isinstance(chats, list):
+            chats = [chats]
+        chat_ids = []
+        preferences = []
+        for chat in chats:
+            if isinstance(chat, dict):
+                chat_id = str(chat["id"])
+                preferences.append((chat_id, ChatPreference(
+                    chat.get("locale", DEFAULT_LOCALE),
+                    chat.get("verbosity", SHORT),
+                )))
+            else:
+                chat_id = str(chat)
+            chat_ids.append(chat_id)
+        subscriptions.append(
+            Subscription(token, tuple(chat_ids), tuple(preferences))
+        )
+    return subscriptions
+
+
+def load_subscriptions(
+    path: Optional[str], raw: Optional[str]
+) -> List[Subscription]:
+    """Читает подписки из файла, а если он не задан, из строки JSON."""
+    if path:
+        with open(path, encoding="utf-8") as file:
+            raw = file.read()
+    if not raw:
+        return []
+    return parse_subscriptions(raw)
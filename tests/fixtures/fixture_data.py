@@ -29,3 +29,27 @@ def random_message():
         letters = string.ascii_letters
         return ''.join(random.choice(letters) for _ in range(string_length))
     return random_string()
+
+
+@pytest.fixture(autouse=True)
+def isolated_state(tmp_path, monkeypatch):
+    import homework
+    monkeypatch.setattr(homework, 'STATE_DB', str(tmp_path / 'state.sqlite3'))
+    monkeypatch.setattr(homework, '_store', None)
+    monkeypatch.setattr(homework, '_breakers', {})
+    monkeypatch.setattr(homework, '_delivery', None)
+    monkeypatch.setattr(homework, '_digest', None)
+    yield tmp_path
+    if homework._store is not None:
+        homework._store.close()
+
+
+@pytest.fixture(autouse=True)
+def session_uses_requests_get(monkeypatch):
+    """Route pooled session calls through the `requests.get` test doubles."""
+    import requests
+
+    def session_get(self, url, **kwargs):
+        return requests.get(url, **kwargs)
+
+    monkeypatch.setattr(requests.Session, 'get', session_get)
@@ -550,22 +550,31 @@ class TestHomework:
 
         main_source = inspect.getsource(homework_module.main)
         time_sleep_pattern = re.compile(
-            r'(\# *)?(time\.sleep\( *[\w\d=_\-\'\"]* *\))'
+            r'(\# *)?(shutdown\.sleep\( *[\w\d=_\-\'\"]* *\))'
         )
         search_result = re.search(time_sleep_pattern, main_source)
         is_commented = search_result[1] is None if search_result else False
         assert search_result and is_commented, (
-            'Убедитесь, что в `main()` применена функция `time.sleep()`.'
+            'Убедитесь, что в `main()` пауза между запросами прерывается '
+            'при остановке: `shutdown.sleep()`.'
         )
 
         def sleep_to_interrupt(secs):
             assert secs == self.RETRY_PERIOD, (
                 'Убедитесь, что повторный запрос к API домашки отправляется '
-                'через 10 минут: `time.sleep(RETRY_PERIOD)`.'
+                'через 10 минут: `shutdown.sleep(RETRY_PERIOD)`.'
             )
             raise utils.BreakInfiniteLoop('break')
 
         monkeypatch.setattr(time, 'sleep', sleep_to_interrupt)
+        monkeypatch.setattr(
+            homework_module.ShutdownCoordinator, 'sleep',
+            lambda coordinator, secs: sleep_to_interrupt(secs)
+        )
+        monkeypatch.setattr(
+            homework_module.ShutdownCoordinator, 'install',
+            lambda coordinator: None
+        )
 
         def mock_telegram_bot(random_message=random_message, *args, **kwargs):
             return utils.MockTelegramBot(*args,
@@ -731,13 +740,13 @@ class TestHomework:
 
         hw_status = data_with_new_hw_status['homeworks'][0]['status']
 
-        def mock_send_message(bot, message=''):
+        def mock_send_to_chat(bot, chat_id=None, message=''):
             logging.warn(message)
 
         monkeypatch.setattr(
             homework_module,
-            'send_message',
-            mock_send_message
+            'send_to_chat',
+            mock_send_to_chat
         )
         with caplog.at_level(logging.WARN):
             try:
@@ -753,6 +762,65 @@ class TestHomework:
                     'из переменной `HOMEWORK_VERDICTS`.'
                 )
 
+    def test_single_subscription_from_env(self, monkeypatch,
+                                          homework_module):
+        monkeypatch.setattr(homework_module, 'SUBSCRIPTIONS_FILE', None)
+        monkeypatch.setattr(homework_module, 'SUBSCRIPTIONS', None)
+        monkeypatch.setattr(homework_module, 'PRACTICUM_TOKEN', 'sometoken')
+        monkeypatch.setattr(homework_module, 'TELEGRAM_CHAT_ID', '12345')
+        subscriptions = homework_module.get_subscriptions()
+        assert [(s.token, s.chat_ids) for s in subscriptions] == [
+            ('sometoken', ('12345',))
+        ], (
+            'Без файла подписок бот должен работать с токеном и чатом из '
+            'переменных окружения.'
+        )
+
+    def test_poll_reports_every_changed_homework(self, monkeypatch,
+                                                 random_timestamp,
+                                                 homework_module):
+        data = {
+            'homeworks': [
+                {'id': 1, 'homework_name': 'hw1', 'status': 'approved'},
+                {'id': 2, 'homework_name': 'hw2', 'status': 'reviewing'},
+            ],
+            'current_date': random_timestamp
+        }
+        monkeypatch.setattr(
+            requests, 'get',
+            create_mock_response_get_with_custom_status_and_data(
+                random_timestamp, HTTPStatus.OK, data
+            )
+        )
+        sent = []
+        monkeypatch.setattr(
+            homework_module, 'send_to_chat',
+            lambda bot, chat_id, message: sent.append(message)
+        )
+        subscription = homework_module.Subscription('token', ('1',))
+        state = homework_module.PollState(0)
+
+        homework_module.poll_subscription(None, subscription, state)
+        assert len(sent) == 2, (
+            'Бот должен сообщать о каждой работе с изменившимся статусом.'
+        )
+        assert state.from_date == random_timestamp
+
+        homework_module.poll_subscription(None, subscription, state)
+        assert len(sent) == 2, (
+            'Повторный опрос без изменений не должен отправлять сообщений.'
+        )
+
+        restarted_state = homework_module.PollState(0)
+        restarted_state.statuses = homework_module.get_store().load_statuses(
+            subscription.key
+        )
+        homework_module.poll_subscription(None, subscription, restarted_state)
+        assert len(sent) == 2, (
+            'После перезапуска бот не должен повторно отправлять '
+            'уже известные статусы.'
+        )
+
     def test_docstrings(self, homework_module):
         for func in self.HOMEWORK_FUNC_WITH_PARAMS_QTY:
             utils.check_docstring(homework_module, func)
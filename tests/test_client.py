@@ -0,0 +1,133 @@
+import requests
+
+from client import PracticumClient, ResponseValidators
+
+
+class TestPracticumClient:
+    ENDPOINT = 'https://practicum.yandex.ru/api/user_api/homework_statuses/'
+
+    def test_session_pool_is_mounted(self):
+        client = PracticumClient(self.ENDPOINT, pool_size=3)
+        adapter = client.session.get_adapter(self.ENDPOINT)
+        assert adapter._pool_maxsize == 3, (
+            'Размер пула соединений должен задаваться при создании клиента.'
+        )
+        client.close()
+
+    def test_timeout_is_passed(self, monkeypatch):
+        calls = []
+
+        def mock_get(url, **kwargs):
+            calls.append(kwargs)
+
+        monkeypatch.setattr(requests, 'get', mock_get)
+        client = PracticumClient(self.ENDPOINT, timeout=(1, 2))
+        client.get({'Authorization': 'OAuth x'}, {'from_date': 0})
+        assert calls and calls[0]['timeout'] == (1, 2), (
+            'Каждый запрос к API должен выполняться с таймаутом.'
+        )
+
+    def test_client_is_reused(self, homework_module):
+        assert homework_module.get_client() is homework_module.get_client()
+
+    def test_client_is_created_once_across_threads(self, monkeypatch,
+                                                    homework_module):
+        import threading
+        import time
+
+        created = []
+
+        def slow_client(*args, **kwargs):
+            time.sleep(0.01)
+            created.append(object())
+            return created[-1]
+
+        monkeypatch.setattr(homework_module, '_client', None)
+        monkeypatch.setattr(homework_module, 'PracticumClient', slow_client)
+        clients = []
+        threads = [
+            threading.Thread(
+                target=lambda: clients.append(homework_module.get_client())
+            )
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(created) == 1, (
+            'Потоки первого раунда не должны создавать несколько клиентов.'
+        )
+        assert all(client is created[0] for client in clients)
+
+
+class TestResponseValidators:
+
+    def make_response(self, content, headers=None):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = content
+        response.headers.update(headers or {})
+        return response
+
+    def test_body_hash_ignores_current_date(self):
+        validators = ResponseValidators()
+        assert not validators.is_unchanged(self.make_response(
+            b'{"homeworks": [], "current_date": 100}'
+        ))
+        assert validators.is_unchanged(self.make_response(
+            b'{"homeworks": [], "current_date": 200}'
+        )), 'Ответ, отличающийся только current_date, не изменился.'
+        assert not validators.is_unchanged(self.make_response(
+            b'{"homeworks": [{"id": 1}], "current_date": 300}'
+        ))
+
+    def test_conditional_headers_for_same_from_date(self):
+        validators = ResponseValidators()
+        validators.is_unchanged(self.make_response(
+            b'{}', {'ETag': '"abc"', 'Last-Modified': 'yesterday'}
+        ))
+        validators.from_date = 100
+        assert validators.request_headers(100) == {
+            'If-None-Match': '"abc"', 'If-Modified-Since': 'yesterday'
+        }
+        assert validators.request_headers(200) == {}
+
+    def test_not_modified_skips_parsing(self, monkeypatch, homework_module):
+        def mock_get(url, **kwargs):
+            response = self.make_response(b'')
+            response.status_code = 304
+            return response
+
+        monkeypatch.setattr(requests, 'get', mock_get)
+        assert homework_module.fetch_statuses(
+            {}, 0, ResponseValidators()
+        ) is None
+
+    def test_failed_body_is_processed_again(self, monkeypatch,
+                                            homework_module):
+        body = (
+            b'{"homeworks": [{"id": 1, "homework_name": "hw", '
+            b'"status": "approved"}, {"id": 2, "homework_name": "hw2", '
+            b'"status": "weird"}], "current_date": 100}'
+        )
+        monkeypatch.setattr(
+            requests, 'get', lambda url, **kwargs: self.make_response(body)
+        )
+        sent = []
+        monkeypatch.setattr(
+            homework_module, 'send_to_chat',
+            lambda bot, chat_id, message: sent.append(message),
+        )
+        subscription = homework_module.Subscription('token', ('1',))
+        state = homework_module.PollState(0)
+        for _ in range(2):
+            homework_module.poll_subscription(None, subscription, state)
+        assert state.error is not None, (
+            'Тот же некорректный ответ не должен считаться восстановлением.'
+        )
+        assert not any('восстановлена' in message for message in sent)
+        assert sent.count(homework_module.parse_status(
+            {'homework_name': 'hw', 'status': 'approved'}
+        )) == 1
+        assert state.from_date == 100
@@ -0,0 +1,94 @@
+import threading
+
+import telegram
+
+from delivery import MESSAGE_LIMIT, DeliveryQueue
+
+
+class TestDeliveryQueue:
+
+    def test_pending_messages_are_coalesced_per_chat(self):
+        release = threading.Event()
+        sent = []
+
+        def send(chat_id, text):
+            release.wait(1)
+            sent.append((chat_id, text))
+
+        queue = DeliveryQueue(send, chat_interval=0, global_rate=1000)
+        queue.put('1', 'first')
+        queue.put('1', 'second')
+        queue.put('1', 'third')
+        queue.put('2', 'other')
+        release.set()
+        assert queue.close(timeout=2)
+        texts = [text for chat_id, text in sent if chat_id == '1']
+        assert '\n\n'.join(texts) == 'first\n\nsecond\n\nthird'
+        assert len(sent) < 4, (
+            'Ожидающие сообщения одного чата должны объединяться.'
+        )
+
+    def test_coalesced_message_fits_telegram_limit(self):
+        queue = DeliveryQueue(lambda chat_id, text: None)
+        queue.closed = True
+        queue.pending['1'] = ['a' * 3000, 'b' * 3000]
+        assert queue._take('1') == 'a' * 3000
+        assert len(queue._take('1')) <= MESSAGE_LIMIT
+
+    def test_jobs_are_not_coalesced(self):
+        queue = DeliveryQueue(lambda chat_id, text: None)
+        queue.closed = True
+
+        def job():
+            pass
+
+        queue.pending['1'] = ['first', job, 'second']
+        assert queue._take('1') == 'first', (
+            'Текст не должен объединяться через задачу.'
+        )
+        assert queue._take('1') is job
+        assert queue._take('1') == 'second'
+
+    def test_transient_errors_are_retried(self):
+        calls = []
+
+        def send(chat_id, text):
+            calls.append(text)
+            if len(calls) < 3:
+                raise telegram.error.TimedOut()
+
+        queue = DeliveryQueue(send, chat_interval=0, retry_base=0.01)
+        queue.put('1', 'message')
+        assert queue.close(timeout=2)
+        assert calls == ['message'] * 3
+
+    def test_permanent_errors_are_dropped(self):
+        calls = []
+
+        def send(chat_id, text):
+            calls.append(text)
+            raise telegram.error.BadRequest('Chat not found')
+
+        queue = DeliveryQueue(send, chat_interval=0, retry_base=0.01)
+        queue.put('1', 'message')
+        assert queue.close(timeout=2)
+        assert calls == ['message']
+        assert queue.size() == 0
+
+    def test_failing_job_does_not_stop_worker(self):
+        sent = []
+
+        def job():
+            raise RuntimeError('database is locked')
+
+        queue = DeliveryQueue(
+            lambda chat_id, text: sent.append(text), chat_interval=0
+        )
+        queue.put('1', job)
+        assert queue.join(timeout=2)
+        queue.put('1', 'message')
+        assert queue.close(timeout=2)
+        assert queue.worker.is_alive() is False
+        assert sent == ['message'], (
+            'Сбой задачи не должен останавливать поток отправки.'
+        )
@@ -0,0 +1,187 @@
+from delivery import MESSAGE_LIMIT
+from digest import DigestBuffer, split_digest
+from state import StateStore
+
+
+class TestDigestBuffer:
+
+    def test_messages_are_sent_once_per_window(self):
+        sent = []
+        digest = DigestBuffer(
+            lambda chat_id, text: sent.append((chat_id, text)), window=60
+        )
+        digest.put('1', 'first')
+        digest.put('1', 'second')
+        digest.put('2', 'other')
+        assert digest.flush_due() == 0
+        assert sent == [], 'Сводка не должна уходить до окончания окна.'
+        assert digest.flush_due(now=max(digest.started.values()) + 60) == 2
+        assert sent == [
+            ('1', 'Изменения статусов работ: 2\n\nfirst\n\nsecond'),
+            ('2', 'Изменения статусов работ: 1\n\nother'),
+        ]
+        assert digest.size() == 0
+
+    def test_long_digest_is_split(self):
+        parts = split_digest(['a' * 3000, 'b' * 3000, 'c' * 5000])
+        assert len(parts) == 3
+        assert all(len(part) <= MESSAGE_LIMIT for part in parts)
+
+    def test_pending_digest_survives_restart(self, tmp_path):
+        store = StateStore(str(tmp_path / 'state.sqlite3'))
+        DigestBuffer(lambda chat_id, text: None, 60, store).put('1', 'first')
+        sent = []
+        digest = DigestBuffer(
+            lambda chat_id, text: sent.append(text), 60, store
+        )
+        digest.flush_due(now=digest.started['1'] + 60)
+        assert sent == ['Изменения статусов работ: 1\n\nfirst']
+        assert store.load_digests() == []
+        store.close()
+
+    def test_shard_loads_only_own_digests(self, tmp_path):
+        store = StateStore(str(tmp_path / 'state.sqlite3'))
+        buffer = DigestBuffer(lambda chat_id, text: None, 60, store)
+        buffer.put('1', 'mine', 'a')
+        buffer.put('1', 'theirs', 'b')
+        sent = []
+        digest = DigestBuffer(
+            lambda chat_id, text: sent.append(text), 60, store,
+            subscriptions={'a'},
+        )
+        digest.flush_due(now=digest.started['1'] + 60)
+        assert sent == ['Изменения статусов работ: 1\n\nmine'], (
+            'Шард не должен отправлять сводки чужих подписок.'
+        )
+        assert [row[1] for row in store.load_digests()] == ['b']
+        store.close()
+
+    def test_failed_digest_is_kept(self, tmp_path):
+        store = StateStore(str(tmp_path / 'state.sqlite3'))
+        sent = []
+
+        def send(chat_id, text):
+            if not sent:
+                sent.append(None)
+                raise RuntimeError('Timed out')
+            sent.append(text)
+
+        digest = DigestBuffer(send, 60, store)
+        digest.put('1', 'first')
+        due = digest.started['1'] + 60
+        assert digest.flush_due(now=due) == 0
+        assert len(store.load_digests()) == 1, (
+            'Неотправленная сводка должна оставаться в хранилище.'
+        )
+        assert digest.flush_due(now=due) == 1
+        assert sent[1:] == ['Изменения статусов работ: 1\n\nfirst']
+        assert store.load_digests() == []
+        store.close()
+
+    def test_only_unsent_parts_are_retried(self):
+        sent = []
+
+        def send(chat_id, text):
+            if len(sent) == 1:
+                sent.append(None)
+                raise RuntimeError('Timed out')
+            sent.append(text)
+
+        digest = DigestBuffer(send, 60)
+        for letter in 'abc':
+            digest.put('1', letter * 3000)
+        due = digest.started['1'] + 60
+        digest.flush_due(now=due)
+        assert digest.size() == 2
+        digest.flush_due(now=due)
+        assert digest.size() == 0
+        assert [text[-1] for text in sent if text] == ['a', 'b', 'c'], (
+            'Отправленные части сводки не должны повторяться.'
+        )
+
+
+class TestDigestMode:
+
+    def test_status_changes_are_batched(self, monkeypatch):
+        import homework
+        from subscriptions import Subscription
+
+        sent = []
+        monkeypatch.setattr(
+            homework, 'send_to_chat',
+            lambda bot, chat_id, message: sent.append(message) or 1,
+        )
+        monkeypatch.setattr(homework, 'DIGEST_WINDOW', 60)
+        digest = homework.start_digest(None)
+        subscription = Subscription('token', ('1',))
+        state = homework.PollState(0)
+        homework.handle_response(None, subscription, state, {
+            'homeworks': [
+                {'id': 1, 'homework_name': 'a', 'status': 'approved'},
+                {'id': 2, 'homework_name': 'b', 'status': 'rejected'},
+            ],
+            'current_date': 100,
+        })
+        homework.report_error(None, subscription, state, Exception('boom'))
+        assert sent == ['Сбой в работе программы: boom'], (
+            'В режиме сводок ошибки должны отправляться сразу.'
+        )
+        digest.flush_due(now=digest.started['1'] + 60)
+        assert len(sent) == 2
+        assert sent[1].startswith('Изменения статусов работ: 2')
+
+    def test_header_follows_chat_locale(self, monkeypatch):
+        import homework
+        from messages import ChatPreference
+        from subscriptions import Subscription
+
+        sent = []
+        monkeypatch.setattr(
+            homework, 'send_to_chat',
+            lambda bot, chat_id, message: sent.append(message) or 1,
+        )
+        monkeypatch.setattr(homework, 'DIGEST_WINDOW', 60)
+        subscription = Subscription(
+            'token', ('1',), (('1', ChatPreference('en')),)
+        )
+        digest = homework.start_digest(None, [subscription])
+        homework.handle_response(None, subscription, homework.PollState(0), {
+            'homeworks': [
+                {'id': 1, 'homework_name': 'a', 'status': 'approved'},
+            ],
+            'current_date': 100,
+        })
+        digest.flush_due(now=digest.started['1'] + 60)
+        assert sent[0].startswith('Homework status changes: 1'), (
+            'Заголовок сводки должен быть на языке чата.'
+        )
+
+    def test_failed_send_keeps_digest(self, monkeypatch):
+        import homework
+        from subscriptions import Subscription
+
+        monkeypatch.setattr(
+            homework, 'send_to_chat', lambda bot, chat_id, message: None
+        )
+        monkeypatch.setattr(homework, 'DIGEST_WINDOW', 60)
+        digest = homework.start_digest(None)
+        digest.put('1', 'first', Subscription('token', ('1',)).key)
+        digest.flush_due(now=digest.started['1'] + 60)
+        assert digest.size() == 1, (
+            'Сбой отправки не должен терять накопленную сводку.'
+        )
+        assert len(homework.get_store().load_digests()) == 1
+
+    def test_unsharded_bot_loads_legacy_digests(self, monkeypatch):
+        import homework
+        from subscriptions import Subscription
+
+        monkeypatch.setattr(homework, 'DIGEST_WINDOW', 60)
+        homework.get_store().add_digest('', '1', 0, 'legacy')
+        subscription = Subscription('token', ('1',))
+        monkeypatch.setattr(homework, 'SHARD_COUNT', 2)
+        assert homework.start_digest(None, [subscription]).size() == 0
+        monkeypatch.setattr(homework, 'SHARD_COUNT', 1)
+        assert homework.start_digest(None, [subscription]).size() == 1, (
+            'Бот без шардов должен отправлять сводки без подписки.'
+        )
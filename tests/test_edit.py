@@ -0,0 +1,134 @@
+import telegram
+
+from schema import Homework
+from subscriptions import Subscription
+
+SUBSCRIPTION = Subscription('token', ('1',))
+
+
+class FakeBot:
+
+    def __init__(self, edit_error=None):
+        self.sent = []
+        self.edited = []
+        self.edit_error = edit_error
+        self.edit_errors = []
+
+    def send_message(self, chat_id, text):
+        self.sent.append((chat_id, text))
+        return telegram.Message(
+            len(self.sent), None, telegram.Chat(chat_id, 'private')
+        )
+
+    def edit_message_text(self, text, chat_id, message_id):
+        if self.edit_errors:
+            raise self.edit_errors.pop(0)
+        if self.edit_error is not None:
+            raise self.edit_error
+        self.edited.append((chat_id, message_id, text))
+
+
+class TestEditMode:
+
+    def notify(self, homework_module, bot, status):
+        homework = Homework('hw.zip', status, id=1)
+        homework_module.notify(
+            bot, SUBSCRIPTION, homework_module.parse_status(homework),
+            homework,
+        )
+
+    def test_status_changes_edit_one_message(self, monkeypatch,
+                                             homework_module):
+        monkeypatch.setattr(homework_module, 'EDIT_MESSAGES', True)
+        bot = FakeBot()
+        for status in ('reviewing', 'rejected', 'reviewing', 'approved'):
+            self.notify(homework_module, bot, status)
+        assert len(bot.sent) == 1, (
+            'В режиме редактирования о работе должно отправляться '
+            'одно сообщение.'
+        )
+        assert [message_id for _, message_id, _ in bot.edited] == [1, 1, 1]
+        assert bot.edited[-1][2].endswith(
+            homework_module.HOMEWORK_VERDICTS['approved']
+        )
+
+    def test_message_id_survives_restart(self, monkeypatch,
+                                         homework_module):
+        monkeypatch.setattr(homework_module, 'EDIT_MESSAGES', True)
+        bot = FakeBot()
+        self.notify(homework_module, bot, 'reviewing')
+        homework_module.get_store().close()
+        monkeypatch.setattr(homework_module, '_store', None)
+        self.notify(homework_module, bot, 'approved')
+        assert len(bot.sent) == 1
+        assert len(bot.edited) == 1
+
+    def test_missing_message_is_sent_again(self, monkeypatch,
+                                           homework_module):
+        monkeypatch.setattr(homework_module, 'EDIT_MESSAGES', True)
+        bot = FakeBot()
+        self.notify(homework_module, bot, 'reviewing')
+        bot.edit_error = telegram.error.BadRequest(
+            'Message to edit not found'
+        )
+        self.notify(homework_module, bot, 'approved')
+        assert len(bot.sent) == 2
+        assert homework_module.get_store().load_message_id(
+            '1', SUBSCRIPTION.key, '1'
+        ) == 2
+
+    def test_unmodified_message_is_not_resent(self, monkeypatch,
+                                              homework_module):
+        monkeypatch.setattr(homework_module, 'EDIT_MESSAGES', True)
+        bot = FakeBot()
+        self.notify(homework_module, bot, 'reviewing')
+        bot.edit_error = telegram.error.BadRequest(
+            'Message is not modified'
+        )
+        self.notify(homework_module, bot, 'reviewing')
+        assert len(bot.sent) == 1
+
+    def test_default_mode_sends_new_messages(self, homework_module):
+        bot = FakeBot()
+        self.notify(homework_module, bot, 'reviewing')
+        self.notify(homework_module, bot, 'approved')
+        assert len(bot.sent) == 2
+        assert bot.edited == []
+
+    def test_transient_error_does_not_send_duplicate(self, monkeypatch,
+                                                     homework_module):
+        monkeypatch.setattr(homework_module, 'EDIT_MESSAGES', True)
+        bot = FakeBot()
+        self.notify(homework_module, bot, 'reviewing')
+        for error in (
+            telegram.error.RetryAfter(1),
+            telegram.error.TimedOut(),
+            telegram.error.NetworkError('reset'),
+            telegram.error.BadRequest('Chat not found'),
+        ):
+            bot.edit_error = error
+            self.notify(homework_module, bot, 'approved')
+        assert len(bot.sent) == 1, (
+            'Временная ошибка изменения не должна приводить '
+            'к отправке нового сообщения.'
+        )
+
+    def test_edits_go_through_delivery_queue(self, monkeypatch,
+                                             homework_module):
+        from delivery import DeliveryQueue
+
+        monkeypatch.setattr(homework_module, 'EDIT_MESSAGES', True)
+        bot = FakeBot()
+        queue = DeliveryQueue(
+            bot.send_message, chat_interval=0, retry_base=0
+        )
+        monkeypatch.setattr(homework_module, '_delivery', queue)
+        self.notify(homework_module, bot, 'reviewing')
+        assert queue.join(5)
+        bot.edit_errors = [telegram.error.TimedOut()]
+        self.notify(homework_module, bot, 'approved')
+        assert queue.close(5)
+        assert len(bot.sent) == 1
+        assert [message_id for _, message_id, _ in bot.edited] == [1], (
+            'Изменение после временной ошибки должно повторяться очередью.'
+        )
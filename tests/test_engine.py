@@ -0,0 +1,71 @@
+import threading
+import time
+
+from engine import AsyncPollingEngine
+from subscriptions import PollState, Subscription
+
+
+class TestAsyncPollingEngine:
+
+    def test_all_subscriptions_polled_with_bounded_concurrency(self):
+        lock = threading.Lock()
+        in_flight = []
+        peak = []
+        polled = []
+
+        def poll(bot, subscription, state):
+            with lock:
+                in_flight.append(subscription.key)
+                peak.append(len(in_flight))
+            time.sleep(0.01)
+            with lock:
+                in_flight.remove(subscription.key)
+                polled.append(subscription.token)
+
+        subscriptions = [
+            Subscription(f'token{i}', (str(i),)) for i in range(20)
+        ]
+        states = {s.key: PollState(0) for s in subscriptions}
+        engine = AsyncPollingEngine(poll, concurrency=4)
+        engine.run_round(None, subscriptions, states)
+        engine.close()
+
+        assert sorted(polled) == sorted(s.token for s in subscriptions)
+        assert max(peak) <= 4, (
+            'Число одновременных запросов не должно превышать лимит.'
+        )
+
+    def test_poll_errors_do_not_stop_round(self):
+        polled = []
+
+        def poll(bot, subscription, state):
+            if subscription.token == 'broken':
+                raise RuntimeError('boom')
+            polled.append(subscription.token)
+
+        subscriptions = [Subscription('broken', ('1',)),
+                         Subscription('ok', ('2',))]
+        states = {s.key: PollState(0) for s in subscriptions}
+        engine = AsyncPollingEngine(poll, concurrency=2)
+        engine.run_round(None, subscriptions, states)
+        engine.close()
+        assert polled == ['ok']
+
+    def test_stop_skips_unstarted_polls(self):
+        polled = []
+        stop = threading.Event()
+
+        def poll(bot, subscription, state):
+            polled.append(subscription.token)
+            stop.set()
+
+        subscriptions = [
+            Subscription(f'token{i}', (str(i),)) for i in range(10)
+        ]
+        states = {s.key: PollState(0) for s in subscriptions}
+        engine = AsyncPollingEngine(poll, concurrency=1)
+        engine.run_round(None, subscriptions, states, stop.is_set)
+        engine.close()
+        assert polled == ['token0'], (
+            'После остановки не начатые опросы раунда должны пропускаться.'
+        )
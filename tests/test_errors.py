@@ -0,0 +1,119 @@
+from exceptions import ApiRequestError, HttpStatusNotOkError
+from subscriptions import Subscription
+
+SUBSCRIPTION = Subscription('token', ('1',))
+
+
+class TestErrorNotifications:
+
+    def setup_sent(self, monkeypatch, homework_module):
+        sent = []
+        monkeypatch.setattr(
+            homework_module, 'send_to_chat',
+            lambda bot, chat_id, message: sent.append(message),
+        )
+        return sent
+
+    def poll(self, monkeypatch, homework_module, state, error=None):
+        def fetch_statuses(*args):
+            if error is not None:
+                raise error
+            return None
+
+        monkeypatch.setattr(homework_module, 'fetch_statuses', fetch_statuses)
+        homework_module.poll_subscription(None, SUBSCRIPTION, state)
+
+    def test_changing_error_text_is_reported_once(self, monkeypatch,
+                                                  homework_module):
+        sent = self.setup_sent(monkeypatch, homework_module)
+        state = homework_module.PollState(0)
+        for second in range(3):
+            self.poll(monkeypatch, homework_module, state, ApiRequestError(
+                f'Ошибка при запросе к основному API в {second}'
+            ))
+        assert sent == [
+            'Сбой в работе программы: '
+            'Ошибка при запросе к основному API в 0'
+        ], 'Сбой одного вида должен сообщаться один раз за период тишины.'
+
+    def test_http_statuses_are_reported_separately(self, monkeypatch,
+                                                   homework_module):
+        sent = self.setup_sent(monkeypatch, homework_module)
+        state = homework_module.PollState(0)
+        for status in (500, 503, 500):
+            self.poll(monkeypatch, homework_module, state,
+                      HttpStatusNotOkError(f'{status}', status_code=status))
+        assert len(sent) == 2
+
+    def test_error_is_repeated_after_quiet_period(self, monkeypatch,
+                                                  homework_module):
+        sent = self.setup_sent(monkeypatch, homework_module)
+        monkeypatch.setattr(homework_module, 'ERROR_QUIET_PERIOD', 0)
+        state = homework_module.PollState(0)
+        for _ in range(2):
+            self.poll(monkeypatch, homework_module, state,
+                      ApiRequestError('boom'))
+        assert len(sent) == 2
+
+    def test_recovery_is_reported_once(self, monkeypatch, homework_module):
+        sent = self.setup_sent(monkeypatch, homework_module)
+        state = homework_module.PollState(0)
+        self.poll(monkeypatch, homework_module, state)
+        assert sent == [], 'Без сбоя сообщение о восстановлении не нужно.'
+        self.poll(monkeypatch, homework_module, state,
+                  ApiRequestError('boom'))
+        self.poll(monkeypatch, homework_module, state)
+        self.poll(monkeypatch, homework_module, state)
+        assert sent == [
+            'Сбой в работе программы: boom',
+            'Работа программы восстановлена.',
+        ]
+
+    def test_flapping_api_is_reported_once(self, monkeypatch,
+                                           homework_module):
+        sent = self.setup_sent(monkeypatch, homework_module)
+        state = homework_module.PollState(0)
+        for _ in range(3):
+            self.poll(monkeypatch, homework_module, state,
+                      ApiRequestError('boom'))
+            self.poll(monkeypatch, homework_module, state)
+        assert sent == [
+            'Сбой в работе программы: boom',
+            'Работа программы восстановлена.',
+        ], (
+            'Чередование сбоев и успешных опросов не должно обходить '
+            'период тишины.'
+        )
+
+    def test_recovery_after_quiet_period_is_silent(self, monkeypatch,
+                                                   homework_module):
+        sent = self.setup_sent(monkeypatch, homework_module)
+        state = homework_module.PollState(0)
+        self.poll(monkeypatch, homework_module, state,
+                  ApiRequestError('boom'))
+        monkeypatch.setattr(homework_module, 'ERROR_QUIET_PERIOD', 0)
+        self.poll(monkeypatch, homework_module, state)
+        assert sent == ['Сбой в работе программы: boom']
+
+    def test_invalid_homework_does_not_block_others(self, monkeypatch,
+                                                     homework_module):
+        sent = self.setup_sent(monkeypatch, homework_module)
+        response = {
+            'homeworks': [
+                {'id': 1, 'homework_name': 'hw', 'status': 'approved'},
+                {'id': 2, 'homework_name': 'hw2', 'status': 'on_hold'},
+            ],
+            'current_date': 100,
+        }
+        monkeypatch.setattr(homework_module, 'fetch_statuses',
+                            lambda *args: response)
+        state = homework_module.PollState(0)
+        for _ in range(3):
+            homework_module.poll_subscription(None, SUBSCRIPTION, state)
+        assert sent == [
+            homework_module.parse_status(response['homeworks'][0]),
+            'Сбой в работе программы: '
+            'Неопределенный статус работы: on_hold',
+        ], 'Корректные записи должны сообщаться несмотря на некорректные.'
+        assert state.from_date == 100
+        assert list(state.statuses) == ['1']
@@ -0,0 +1,20 @@
+from benchmarks import load_test
+
+
+class TestLoadHarness:
+
+    def test_small_run_delivers_notifications(self, homework_module):
+        client = homework_module._client
+        metrics = load_test.run(
+            tokens=3, rounds=2, interval=0.2, api_latency=0,
+            telegram_latency=0, engine='sync', concurrency=2, samples=2
+        )
+        assert metrics['polls'] == 6
+        assert metrics['api_requests'] >= metrics['polls']
+        assert metrics['messages'] > 0, (
+            'Имитатор Telegram должен получать уведомления о смене статуса.'
+        )
+        assert metrics['latency_p99'] >= metrics['latency_p50'] >= 0
+        assert homework_module._client is client, (
+            'Харнесс должен восстанавливать глобальные объекты бота.'
+        )
@@ -0,0 +1,57 @@
+import atexit
+import json
+import logging
+
+import logs
+
+
+class TestLogs:
+
+    def test_json_formatter(self):
+        record = logging.LogRecord(
+            'homework', logging.ERROR, 'homework.py', 10,
+            'Сбой %s', ('API',), None
+        )
+        payload = json.loads(logs.JsonFormatter().format(record))
+        assert payload['level'] == 'ERROR'
+        assert payload['logger'] == 'homework'
+        assert payload['message'] == 'Сбой API'
+
+    def test_logging_goes_through_queue(self, homework_module):
+        listener = logs.setup_logging('DEBUG', 'json')
+        assert logs.setup_logging('INFO', 'text') is listener, (
+            'Повторная настройка не должна добавлять обработчики.'
+        )
+        assert any(
+            isinstance(handler, logging.handlers.QueueHandler)
+            for handler in logging.getLogger().handlers
+        )
+        assert not logging.getLogger(homework_module.__name__).handlers, (
+            'Логгер бота не должен писать в поток синхронно.'
+        )
+
+    def test_third_party_debug_is_quiet(self, homework_module):
+        logs.setup_logging('DEBUG', 'json')
+        for name in ('telegram.bot', 'urllib3.connectionpool'):
+            assert not logging.getLogger(name).isEnabledFor(logging.INFO), (
+                f'Отладочные записи {name} не должны попадать в лог.'
+            )
+        assert logging.getLogger(homework_module.__name__).isEnabledFor(
+            logging.getLevelName(homework_module.LOG_LEVEL.upper())
+        )
+
+    def test_unknown_level_falls_back(self, monkeypatch):
+        import io
+
+        root = logging.getLogger()
+        monkeypatch.setattr(logs, '_listener', None)
+        monkeypatch.setattr(root, 'handlers', [])
+        monkeypatch.setattr(root, 'level', root.level)
+        stream = io.StringIO()
+        listener = logs.setup_logging('verbose', 'text', stream)
+        listener.stop()
+        atexit.unregister(listener.stop)
+        assert root.level == logging.getLevelName(logs.DEFAULT_LEVEL), (
+            'Опечатка в LOG_LEVEL не должна останавливать бота.'
+        )
+        assert 'Неизвестный уровень логирования verbose' in stream.getvalue()
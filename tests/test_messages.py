@@ -0,0 +1,75 @@
+from messages import ChatPreference, MessageRenderer
+from schema import Homework
+
+VERDICTS = {
+    'ru': {'approved': 'Принято {без} подстановок.'},
+    'en': {'approved': 'Approved.'},
+}
+HOMEWORK = Homework(
+    homework_name='hw.zip',
+    status='approved',
+    reviewer_comment='Отлично',
+    date_updated='2022-01-01T00:00:00Z',
+)
+
+
+class TestMessageRenderer:
+
+    def test_default_message(self):
+        renderer = MessageRenderer(VERDICTS)
+        assert renderer.render(HOMEWORK) == (
+            'Изменился статус проверки работы "hw.zip". '
+            'Принято {без} подстановок.'
+        )
+
+    def test_locale_and_verbosity(self):
+        renderer = MessageRenderer(VERDICTS)
+        text = renderer.render(HOMEWORK, ChatPreference('en', 'full'))
+        assert text == (
+            'Review status of "hw.zip" has changed. Approved.\n'
+            'Reviewer comment: Отлично\n'
+            'Updated: 2022-01-01T00:00:00Z'
+        )
+
+    def test_missing_details_are_skipped(self):
+        renderer = MessageRenderer(VERDICTS)
+        homework = Homework('hw.zip', 'approved')
+        text = renderer.render(homework, ChatPreference('ru', 'full'))
+        assert '\n' not in text
+
+    def test_unknown_locale_falls_back_to_default(self):
+        renderer = MessageRenderer(VERDICTS)
+        assert renderer.render(HOMEWORK, ChatPreference('de')) == (
+            renderer.render(HOMEWORK)
+        )
+
+    def test_templates_are_compiled_once(self):
+        renderer = MessageRenderer(VERDICTS)
+        for _ in range(3):
+            renderer.render(HOMEWORK)
+            renderer.render(HOMEWORK, ChatPreference('en', 'full'))
+        assert set(renderer.compiled) == {
+            ('approved', 'ru', 'short'), ('approved', 'en', 'full')
+        }, 'Шаблон должен компилироваться один раз на статус и настройки.'
+
+
+class TestNotify:
+
+    def test_chats_get_their_own_language(self, monkeypatch):
+        import homework
+        from subscriptions import parse_subscriptions
+
+        sent = {}
+        monkeypatch.setattr(
+            homework, 'send_to_chat',
+            lambda bot, chat_id, message: sent.update({chat_id: message}),
+        )
+        subscription, = parse_subscriptions(
+            '{"token": ["1", {"id": "2", "locale": "en"}]}'
+        )
+        hw = Homework('hw.zip', 'rejected')
+        homework.notify(
+            None, subscription, homework.parse_status(hw), hw
+        )
+        assert sent['1'] == homework.parse_status(hw)
+        assert sent['2'].startswith('Review status of "hw.zip"')
@@ -0,0 +1,57 @@
+import urllib.request
+
+import telegram
+
+import metrics
+
+
+class TestMetrics:
+
+    def test_histogram_render(self):
+        histogram = metrics.Histogram(
+            'test_duration_seconds', 'Test.', buckets=(0.1, 1)
+        )
+        histogram.observe(0.05, stage='a')
+        histogram.observe(0.5, stage='a')
+        histogram.observe(5, stage='a')
+        text = histogram.render()
+        assert '# TYPE test_duration_seconds histogram' in text
+        assert 'test_duration_seconds_bucket{stage="a",le="0.1"} 1' in text
+        assert 'test_duration_seconds_bucket{stage="a",le="1"} 2' in text
+        assert 'test_duration_seconds_bucket{stage="a",le="+Inf"} 3' in text
+        assert 'test_duration_seconds_count{stage="a"} 3' in text
+
+    def test_timer_as_decorator(self):
+        histogram = metrics.Histogram('test_timer_seconds', 'Test.')
+
+        @histogram.time()
+        def work():
+            """Docstring is kept."""
+            return 42
+
+        assert work() == 42 and work() == 42
+        assert histogram.values[()] == 2
+        assert work.__doc__ == 'Docstring is kept.'
+
+    def test_send_failures_are_counted(self, monkeypatch, homework_module):
+        class BrokenBot:
+            def send_message(self, chat_id, text):
+                raise telegram.error.TelegramError('Something wrong')
+
+        before = metrics.SEND_FAILURES.value()
+        homework_module.send_to_chat(BrokenBot(), '1', 'message')
+        assert metrics.SEND_FAILURES.value() == before + 1
+
+    def test_metrics_endpoint(self):
+        server = metrics.start_server('127.0.0.1', 0)
+        host, port = server.server_address
+        try:
+            with urllib.request.urlopen(
+                f'http://{host}:{port}/metrics'
+            ) as response:
+                body = response.read().decode()
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert '# TYPE homework_api_request_seconds histogram' in body
+        assert '# TYPE homework_send_failures_total counter' in body
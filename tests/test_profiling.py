@@ -0,0 +1,166 @@
+import os
+
+import metrics
+from profiling import NULL_SPAN, ProfileDumper, SpanRecorder
+
+
+class TestSpanRecorder:
+
+    def test_disabled_recorder_does_nothing(self):
+        recorder = SpanRecorder()
+        assert recorder.span('fetch') is NULL_SPAN, (
+            'Без PROFILE_SPANS замеры не должны создавать объектов.'
+        )
+        with recorder.span('fetch'):
+            pass
+        recorder.add('sleep_drift', 1)
+        assert recorder.flush() == {}
+
+    def test_flush_sums_stages_and_resets(self):
+        recorder = SpanRecorder(enabled=True)
+        before = metrics.STAGE_SECONDS.values.get((('stage', 'send'),), 0)
+        for _ in range(3):
+            with recorder.span('send'):
+                pass
+        recorder.add('sleep_drift', 0.5)
+        totals = recorder.flush()
+        assert set(totals) == {'send', 'sleep_drift'}
+        assert totals['sleep_drift'] == 0.5
+        assert metrics.STAGE_SECONDS.values[(('stage', 'send'),)] == (
+            before + 1
+        ), 'Время этапа должно записываться один раз за итерацию.'
+        assert recorder.flush() == {}, (
+            'После сохранения итерации суммы должны обнуляться.'
+        )
+
+
+class TestProfileDumper:
+
+    def test_request_starts_and_dumps_profile(self, tmp_path):
+        dumper = ProfileDumper(str(tmp_path / 'profiles'), duration=0)
+        assert dumper.poll() is None
+        dumper.request()
+        assert dumper.poll() is None, (
+            'Первый опрос после запроса должен только начать профилирование.'
+        )
+        sum(range(1000))
+        prefix = dumper.poll()
+        assert prefix is not None
+        for suffix in ('.prof', '.tracemalloc'):
+            assert os.path.exists(prefix + suffix), f'Нет файла {suffix}.'
+        assert dumper.poll() is None, (
+            'Без нового запроса профиль не должен сниматься повторно.'
+        )
+
+    def test_worker_threads_are_profiled(self, tmp_path):
+        import pstats
+        import threading
+
+        dumper = ProfileDumper(str(tmp_path), duration=60)
+        dumper.request()
+        dumper.poll()
+
+        def worker_task():
+            return sum(range(1000))
+
+        thread = threading.Thread(target=dumper.profiled(worker_task))
+        thread.start()
+        thread.join()
+        prefix = dumper.stop()
+        assert prefix is not None, (
+            'Начатый профиль должен сохраняться при остановке.'
+        )
+        functions = {
+            name for _, _, name in pstats.Stats(f'{prefix}.prof').stats
+        }
+        assert 'worker_task' in functions, (
+            'Профиль должен включать вызовы из рабочих потоков.'
+        )
+        assert dumper.stop() is None
+
+    def test_task_runs_when_profiler_is_busy(self, tmp_path, monkeypatch):
+        import cProfile
+        import threading
+
+        class BusyProfile(cProfile.Profile):
+            def enable(self, *args, **kwargs):
+                raise ValueError('Another profiling tool is already active')
+
+        dumper = ProfileDumper(str(tmp_path), duration=60)
+        dumper.request()
+        dumper.poll()
+        monkeypatch.setattr(cProfile, 'Profile', BusyProfile)
+        results = []
+        thread = threading.Thread(
+            target=dumper.profiled(lambda: results.append(1))
+        )
+        thread.start()
+        thread.join()
+        monkeypatch.undo()
+        dumper.stop()
+        assert results == [1], (
+            'Занятый профилировщик не должен ломать обёрнутые вызовы.'
+        )
+
+    def test_install_without_signal(self):
+        ProfileDumper('profiles').install(None)
+
+
+class TestMainLoopSpans:
+
+    def run_main(self, monkeypatch, homework_module, interrupted):
+        import pytest
+        import telegram
+
+        flushed = []
+        recorder = SpanRecorder(enabled=True)
+        monkeypatch.setattr(homework_module, 'SPANS', recorder)
+        monkeypatch.setattr(homework_module, 'check_config', lambda: True)
+        monkeypatch.setattr(homework_module, 'get_shard_subscriptions',
+                            lambda: [])
+        monkeypatch.setattr(homework_module, 'POLLING_ENGINE', 'sync')
+        monkeypatch.setattr(homework_module, 'METRICS_PORT', 0)
+        monkeypatch.setattr(telegram, 'Bot', lambda token: None)
+        monkeypatch.setattr(homework_module, 'start_services',
+                            lambda bot, subscriptions: None)
+        monkeypatch.setattr(homework_module, 'start_sources',
+                            lambda *args: [])
+        monkeypatch.setattr(homework_module, 'run_sources',
+                            lambda sources: 5)
+        monkeypatch.setattr(
+            recorder, 'flush',
+            lambda: flushed.append(SpanRecorder.flush(recorder)),
+        )
+        monkeypatch.setattr(
+            homework_module.ShutdownCoordinator, 'install',
+            lambda coordinator: None,
+        )
+
+        def sleep(coordinator, seconds):
+            coordinator.request()
+            return interrupted
+
+        monkeypatch.setattr(
+            homework_module.ShutdownCoordinator, 'sleep', sleep
+        )
+        with pytest.raises(SystemExit):
+            homework_module.main()
+        return flushed
+
+    def test_sleep_drift_belongs_to_its_iteration(self, monkeypatch,
+                                                  homework_module):
+        flushed = self.run_main(monkeypatch, homework_module, False)
+        assert len(flushed) == 1
+        assert set(flushed[0]) == {'iteration', 'sleep_drift'}, (
+            'Отклонение паузы должно попадать в ту же итерацию.'
+        )
+        assert flushed[0]['sleep_drift'] == 0, (
+            'Отклонение паузы не может быть отрицательным.'
+        )
+
+    def test_interrupted_sleep_is_not_recorded(self, monkeypatch,
+                                               homework_module):
+        flushed = self.run_main(monkeypatch, homework_module, True)
+        assert 'sleep_drift' not in flushed[0], (
+            'Прерванная остановкой пауза не должна считаться отклонением.'
+        )
@@ -0,0 +1,111 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from benchmarks.simulator import FakePracticumAPI
+from proxy import CachingProxy, serve, upstream_fetcher
+
+QUERY = (('from_date', '0'),)
+OK = (200, {'ETag': '"v1"'}, b'{"homeworks": [], "current_date": 1}')
+
+
+class TestCachingProxy:
+
+    def test_concurrent_requests_are_coalesced(self):
+        release = threading.Event()
+        calls = []
+
+        def fetch(authorization, query):
+            calls.append(authorization)
+            release.wait(2)
+            return OK
+
+        proxy = CachingProxy(fetch, ttl=0)
+        replies = []
+        threads = [
+            threading.Thread(
+                target=lambda: replies.append(proxy.get('OAuth a', QUERY))
+            )
+            for _ in range(10)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join(2)
+        assert replies == [OK] * 10
+        assert calls == ['OAuth a'], (
+            'Одинаковые одновременные запросы должны уходить в API один раз.'
+        )
+
+    def test_fresh_response_served_from_cache(self):
+        calls = []
+
+        def fetch(authorization, query):
+            calls.append((authorization, query))
+            return OK
+
+        proxy = CachingProxy(fetch, ttl=60)
+        proxy.get('OAuth a', QUERY)
+        proxy.get('OAuth a', QUERY)
+        proxy.get('OAuth b', QUERY)
+        proxy.get('OAuth a', (('from_date', '5'),))
+        assert len(calls) == 3, (
+            'Кеш должен различать токены и параметры запроса.'
+        )
+
+    def test_expired_and_failed_responses_are_not_reused(self):
+        replies = [(500, {}, b''), OK, OK]
+        proxy = CachingProxy(lambda a, q: replies.pop(0), ttl=0.01)
+        assert proxy.get('OAuth a', QUERY)[0] == 500
+        assert proxy.get('OAuth a', QUERY) == OK
+        time.sleep(0.02)
+        proxy.get('OAuth a', QUERY)
+        assert replies == []
+
+    def test_upstream_error_is_raised(self):
+        def fetch(authorization, query):
+            raise requests.ConnectionError('down')
+
+        proxy = CachingProxy(fetch)
+        with pytest.raises(requests.ConnectionError):
+            proxy.get('OAuth a', QUERY)
+        assert proxy.in_flight == {}
+
+    def test_cache_is_bounded(self):
+        proxy = CachingProxy(lambda a, q: OK, ttl=60, max_entries=2)
+        for token in 'abc':
+            proxy.get(f'OAuth {token}', QUERY)
+        assert len(proxy.cache) == 2
+
+
+class TestProxyServer:
+
+    def test_bots_share_upstream_requests(self):
+        with FakePracticumAPI({'token': [(0, 'approved')]}) as practicum:
+            proxy = CachingProxy(upstream_fetcher(practicum.endpoint), ttl=60)
+            server = serve(proxy, '127.0.0.1', 0)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            host, port = server.server_address
+            url = f'http://{host}:{port}/api/user_api/homework_statuses/'
+            try:
+                responses = [
+                    requests.get(
+                        url,
+                        headers={'Authorization': 'OAuth token'},
+                        params={'from_date': 0},
+                        timeout=2,
+                    )
+                    for _ in range(3)
+                ]
+            finally:
+                server.shutdown()
+                server.server_close()
+        assert [r.status_code for r in responses] == [200] * 3
+        assert responses[0].json()['homeworks'][0]['status'] == 'approved'
+        assert practicum.requests == 1, (
+            'Повторные запросы в окне свежести должны отдаваться из кеша.'
+        )
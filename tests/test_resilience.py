@@ -0,0 +1,132 @@
+from http import HTTPStatus
+
+import pytest
+import requests
+
+import utils
+from exceptions import CircuitOpenError, HttpStatusNotOkError
+from resilience import CircuitBreaker, RetryPolicy, parse_retry_after
+from scheduler import PollScheduler
+from subscriptions import PollState, Subscription
+
+
+class TestRetryPolicy:
+
+    def test_full_jitter_bounds(self):
+        policy = RetryPolicy(base=10, cap=60)
+        for attempt, ceiling in ((1, 10), (2, 20), (3, 40), (10, 60)):
+            delays = [policy.delay(attempt) for _ in range(50)]
+            assert all(0 <= delay <= ceiling for delay in delays)
+
+    def test_retry_after_is_lower_bound(self):
+        policy = RetryPolicy(base=10, cap=60)
+        assert policy.delay(1, retry_after=120) == 120
+
+    def test_parse_retry_after(self):
+        assert parse_retry_after('30') == 30
+        assert parse_retry_after(None) is None
+        assert parse_retry_after('garbage') is None
+        assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0
+
+    def test_failed_subscription_is_backed_off(self):
+        scheduler = PollScheduler(
+            600, retry_policy=RetryPolicy(base=100, cap=100)
+        )
+        subscription = Subscription('token', ('1',))
+        state = PollState(0)
+        state.failures = 1
+        state.retry_after = 500
+        scheduler.schedule(state)
+        assert scheduler.due([subscription], {subscription.key: state}) == [], (
+            'Подписка со сбоем не должна опрашиваться до истечения паузы.'
+        )
+        state.failures = 0
+        scheduler.schedule(state)
+        assert scheduler.due(
+            [subscription], {subscription.key: state}
+        ) == [subscription]
+
+
+class TestCircuitBreaker:
+
+    def test_opens_after_threshold_and_half_opens(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr('resilience.time.monotonic', lambda: now[0])
+        breaker = CircuitBreaker(threshold=2, reset_timeout=30)
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert not breaker.allow(), (
+            'После серии сбоев запросы к API должны приостанавливаться.'
+        )
+        now[0] += 30
+        assert breaker.allow()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert not breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        now[0] += 30
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_fetch_stops_requests_when_open(self, monkeypatch,
+                                            homework_module):
+        calls = []
+
+        def mock_response_get(*args, **kwargs):
+            calls.append(args)
+            return utils.MockResponseGET(
+                *args, http_status=HTTPStatus.SERVICE_UNAVAILABLE
+            )
+
+        monkeypatch.setattr(requests, 'get', mock_response_get)
+        monkeypatch.setattr(homework_module, 'BREAKER_THRESHOLD', 2)
+        for _ in range(2):
+            with pytest.raises(HttpStatusNotOkError):
+                homework_module.get_api_answer(0)
+        with pytest.raises(CircuitOpenError):
+            homework_module.get_api_answer(0)
+        assert len(calls) == 2
+
+    def test_breaker_is_per_token(self, monkeypatch, homework_module):
+        def mock_response_get(url, headers=None, **kwargs):
+            status = (
+                HTTPStatus.TOO_MANY_REQUESTS
+                if headers['Authorization'] == 'OAuth limited'
+                else HTTPStatus.OK
+            )
+            return utils.MockResponseGET(
+                url, http_status=status, random_timestamp=1
+            )
+
+        monkeypatch.setattr(requests, 'get', mock_response_get)
+        monkeypatch.setattr(homework_module, 'BREAKER_THRESHOLD', 1)
+        limited = Subscription('limited', ('1',))
+        healthy = Subscription('healthy', ('2',))
+        with pytest.raises(HttpStatusNotOkError):
+            homework_module.fetch_statuses(limited.headers, 0)
+        with pytest.raises(CircuitOpenError):
+            homework_module.fetch_statuses(limited.headers, 0)
+        assert homework_module.fetch_statuses(healthy.headers, 0) == {
+            'homeworks': [], 'current_date': 1
+        }, '429 по одному токену не должен останавливать опрос других.'
+
+    def test_open_breaker_is_not_a_subscription_failure(
+        self, monkeypatch, homework_module
+    ):
+        subscription = Subscription('token', ('1',))
+        breaker = homework_module.get_breaker(subscription.headers)
+        breaker.threshold = 1
+        breaker.record_failure()
+        sent = []
+        monkeypatch.setattr(
+            homework_module, 'send_to_chat',
+            lambda bot, chat_id, message: sent.append(message),
+        )
+        state = PollState(0)
+        homework_module.poll_subscription(None, subscription, state)
+        assert state.failures == 0, (
+            'Отказ разомкнутого выключателя не должен считаться сбоем.'
+        )
+        assert sent == []
@@ -0,0 +1,48 @@
+from scheduler import PollScheduler
+from subscriptions import PollState, Subscription
+
+
+class TestPollScheduler:
+
+    def test_fixed_mode_keeps_retry_period(self):
+        scheduler = PollScheduler(600)
+        state = PollState(0)
+        state.idle_polls = 5
+        subscriptions = [Subscription('token', ('1',))]
+        states = {subscriptions[0].key: state}
+        assert scheduler.interval(state) == 600
+        assert scheduler.due(subscriptions, states) == subscriptions
+        assert scheduler.delay(states) == 600
+
+    def test_reviewing_is_polled_often(self):
+        scheduler = PollScheduler(600, adaptive=True, jitter=0)
+        state = PollState(0)
+        state.idle_polls = 3
+        state.statuses = {'1': ('reviewing', None)}
+        assert scheduler.interval(state) == 120
+
+    def test_idle_backoff_is_bounded(self):
+        scheduler = PollScheduler(
+            600, adaptive=True, max_interval=3000, jitter=0
+        )
+        state = PollState(0)
+        assert scheduler.interval(state) == 600
+        state.idle_polls = 1
+        assert scheduler.interval(state) == 1200
+        state.idle_polls = 100
+        assert scheduler.interval(state) == 3000
+
+    def test_jitter_stays_in_bounds(self):
+        scheduler = PollScheduler(600, adaptive=True, jitter=0.1)
+        state = PollState(0)
+        intervals = {scheduler.interval(state) for _ in range(50)}
+        assert all(540 <= interval <= 660 for interval in intervals)
+        assert len(intervals) > 1
+
+    def test_only_due_subscriptions_are_polled(self):
+        scheduler = PollScheduler(600, adaptive=True, jitter=0)
+        subscriptions = [Subscription('a', ('1',)), Subscription('b', ('2',))]
+        states = {s.key: PollState(0) for s in subscriptions}
+        scheduler.schedule(states[subscriptions[0].key])
+        assert scheduler.due(subscriptions, states) == [subscriptions[1]]
+        assert scheduler.delay(states) == 0
@@ -0,0 +1,73 @@
+import pytest
+
+from benchmarks import parsing
+from exceptions import (
+    InvalidHomeworksError,
+    KeyIsMissingError,
+    ProjStatusNotFoundError,
+    ResponseIsNotDictError,
+    ValueIsNotListError,
+)
+from schema import Homework, validate_response
+
+STATUSES = ('approved', 'reviewing', 'rejected')
+
+
+class TestValidateResponse:
+
+    def test_homeworks_become_records(self):
+        homeworks = validate_response({
+            'homeworks': [{
+                'id': 7,
+                'homework_name': 'hw.zip',
+                'status': 'approved',
+                'date_updated': '2022-01-01T00:00:00Z',
+                'unknown_field': 'ignored',
+            }],
+            'current_date': 1,
+        }, STATUSES)
+        assert homeworks == [
+            Homework('hw.zip', 'approved', 7, '2022-01-01T00:00:00Z')
+        ]
+        assert homeworks[0].key == '7'
+        assert homeworks[0].version == ('approved', '2022-01-01T00:00:00Z')
+        assert not hasattr(homeworks[0], '__dict__'), (
+            'Записи о работах должны использовать __slots__.'
+        )
+
+    @pytest.mark.parametrize('response, error', [
+        ([], ResponseIsNotDictError),
+        ({'current_date': 1}, KeyIsMissingError),
+        ({'homeworks': []}, KeyIsMissingError),
+        ({'homeworks': {}, 'current_date': 1}, ValueIsNotListError),
+    ])
+    def test_invalid_response(self, response, error):
+        with pytest.raises(error):
+            validate_response(response, STATUSES)
+
+    @pytest.mark.parametrize('item, error', [
+        ('hw', ResponseIsNotDictError),
+        ({'status': 'approved'}, KeyIsMissingError),
+        ({'homework_name': 'hw', 'status': 'lost'}, ProjStatusNotFoundError),
+    ])
+    def test_invalid_item_keeps_others(self, item, error):
+        valid = {'homework_name': 'ok', 'status': 'approved'}
+        with pytest.raises(InvalidHomeworksError) as info:
+            validate_response(
+                {'homeworks': [item, valid], 'current_date': 1}, STATUSES
+            )
+        assert [type(e) for e in info.value.errors] == [error]
+        assert info.value.homeworks == [Homework('ok', 'approved')], (
+            'Некорректная запись не должна отменять остальные.'
+        )
+
+    def test_missing_key_message_is_readable(self):
+        with pytest.raises(KeyIsMissingError) as info:
+            validate_response({'current_date': 1}, STATUSES)
+        assert str(info.value) == (
+            'Нет доступных значений в ответе сервера: homeworks'
+        )
+
+    def test_benchmark_runs(self):
+        result = parsing.run([10], repeats=1)
+        assert result[10]['validate_ms'] >= 0
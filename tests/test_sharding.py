@@ -0,0 +1,130 @@
+import pytest
+
+from sharding import HashRing, partition, shard_from_dyno
+from subscriptions import Subscription
+
+SUBSCRIPTIONS = [Subscription(f'token{i}', (str(i),)) for i in range(2000)]
+
+
+class TestHashRing:
+
+    def test_every_subscription_has_one_owner(self):
+        shards = [partition(SUBSCRIPTIONS, shard, 4) for shard in range(4)]
+        owned = [s for shard in shards for s in shard]
+        assert sorted(owned) == sorted(SUBSCRIPTIONS), (
+            'Каждую подписку должен опрашивать ровно один шард.'
+        )
+        assert min(len(shard) for shard in shards) > 2000 / 4 * 0.7
+
+    def test_rebalance_moves_few_subscriptions(self):
+        before, after = HashRing(4), HashRing(5)
+        moved = sum(
+            before.owner(s.key) != after.owner(s.key) for s in SUBSCRIPTIONS
+        )
+        assert moved < len(SUBSCRIPTIONS) * 0.3, (
+            'При добавлении шарда должна переезжать малая часть подписок.'
+        )
+
+    @pytest.mark.parametrize('dyno, shard', [
+        ('worker.1', 0), ('worker.3', 2), ('web.1', 0), (None, None),
+        ('run.1234abc', None),
+    ])
+    def test_shard_from_dyno(self, dyno, shard):
+        assert shard_from_dyno(dyno) == shard
+
+
+class TestShardedBot:
+
+    def test_shard_subscriptions(self, monkeypatch, homework_module):
+        monkeypatch.setattr(homework_module, 'get_subscriptions',
+                            lambda: SUBSCRIPTIONS)
+        monkeypatch.setattr(homework_module, 'SHARD_COUNT', 3)
+        monkeypatch.setattr(homework_module, 'SHARD_INDEX', None)
+        monkeypatch.setenv('DYNO', 'worker.2')
+        assert homework_module.get_shard_subscriptions() == partition(
+            SUBSCRIPTIONS, 1, 3
+        )
+        monkeypatch.setattr(homework_module, 'SHARD_INDEX', '5')
+        with pytest.raises(ValueError):
+            homework_module.get_shard_subscriptions()
+
+    def test_shards_get_own_metrics_port(self, monkeypatch,
+                                         homework_module):
+        ports = []
+        monkeypatch.setattr(homework_module, 'METRICS_PORT', 9100)
+        monkeypatch.setattr(homework_module, 'SHARD_INDEX', None)
+        monkeypatch.setattr(homework_module, 'SHARD_COUNT', 1)
+        monkeypatch.setattr(
+            homework_module, 'main',
+            lambda: ports.append(homework_module.METRICS_PORT),
+        )
+        homework_module.run_shard(2, 3)
+        assert ports == [9102], (
+            'Шарды на одной машине не должны делить порт метрик.'
+        )
+
+    def test_webhook_is_rejected_with_workers(self, monkeypatch,
+                                              homework_module):
+        monkeypatch.setattr(homework_module, 'PRACTICUM_TOKEN', 'token')
+        monkeypatch.setattr(homework_module, 'TELEGRAM_TOKEN', '1:a')
+        monkeypatch.setattr(homework_module, 'TELEGRAM_CHAT_ID', '1')
+        monkeypatch.setattr(homework_module, 'SHARD_WORKERS', 2)
+        assert homework_module.check_config()
+        monkeypatch.setattr(homework_module, 'STATUS_SOURCE', 'both')
+        assert not homework_module.check_config()
+
+    def test_supervisor_restarts_failed_workers(self, monkeypatch,
+                                                homework_module):
+        import multiprocessing
+
+        started = []
+        stopped = []
+
+        class FakeProcess:
+            def __init__(self, target, args, name, daemon):
+                self.args = args
+                self.name = name
+                self.exitcode = {0: None, 1: 1, 2: 0}[args[0]]
+
+            def start(self):
+                started.append(self.args)
+
+            def is_alive(self):
+                return self.exitcode is None
+
+            def terminate(self):
+                stopped.append(self.args)
+                self.exitcode = 0
+
+            def join(self, timeout):
+                pass
+
+        class Context:
+            Process = FakeProcess
+
+        sleeps = []
+
+        def sleep(coordinator, seconds):
+            sleeps.append(seconds)
+            if len(sleeps) == 2:
+                coordinator.request()
+
+        monkeypatch.setattr(multiprocessing, 'get_context',
+                            lambda method: Context)
+        monkeypatch.setattr(
+            homework_module.ShutdownCoordinator, 'sleep', sleep
+        )
+        monkeypatch.setattr(
+            homework_module.ShutdownCoordinator, 'install',
+            lambda coordinator: None,
+        )
+        with pytest.raises(SystemExit) as exit_info:
+            homework_module.supervise(3)
+        assert exit_info.value.code == 0
+        assert started == [(0, 3), (1, 3), (2, 3), (1, 3)], (
+            'Супервизор должен перезапускать только шарды, '
+            'завершившиеся с ошибкой.'
+        )
+        assert stopped == [(0, 3)], (
+            'При остановке супервизор должен передать сигнал живым шардам.'
+        )
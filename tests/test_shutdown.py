@@ -0,0 +1,132 @@
+import os
+import signal
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+
+from benchmarks import startup
+from benchmarks.simulator import FakePracticumAPI
+from shutdown import ShutdownCoordinator
+
+
+class TestShutdownCoordinator:
+
+    def test_signal_interrupts_sleep(self):
+        shutdown = ShutdownCoordinator()
+        previous = signal.getsignal(signal.SIGTERM)
+        shutdown.install()
+        try:
+            threading.Timer(
+                0.05, os.kill, (os.getpid(), signal.SIGTERM)
+            ).start()
+            started = time.monotonic()
+            assert shutdown.sleep(10) is True
+        finally:
+            signal.signal(signal.SIGTERM, previous)
+        assert time.monotonic() - started < 2, (
+            'Сигнал остановки должен прерывать паузу между опросами.'
+        )
+        assert shutdown.requested
+
+    def test_steps_run_in_order_within_deadline(self):
+        shutdown = ShutdownCoordinator(timeout=10)
+        calls = []
+        shutdown.on_shutdown('first', lambda timeout: calls.append(timeout))
+
+        def broken(timeout):
+            raise RuntimeError('boom')
+
+        shutdown.on_shutdown('broken', broken)
+        shutdown.on_shutdown('last', lambda timeout: calls.append('last'))
+        assert shutdown.drain() is False
+        assert 0 < calls[0] <= 10
+        assert calls[1] == 'last', (
+            'Ошибка одного шага не должна отменять остальные.'
+        )
+
+    def test_stop_interrupts_sync_round(self, monkeypatch):
+        import homework
+        from subscriptions import Subscription
+
+        shutdown = ShutdownCoordinator()
+        polled = []
+
+        def poll_subscription(bot, subscription, state):
+            polled.append(subscription.token)
+            shutdown.request()
+
+        monkeypatch.setattr(homework, 'poll_subscription', poll_subscription)
+        subscriptions = [Subscription(f'token{i}', (str(i),))
+                         for i in range(3)]
+        states = {s.key: homework.PollState(0) for s in subscriptions}
+        homework.poll_all(
+            None, subscriptions, states, stopped=lambda: shutdown.requested
+        )
+        assert polled == ['token0'], (
+            'Остановка не должна ждать опроса оставшихся подписок.'
+        )
+
+
+class TestGracefulStop:
+
+    def test_sigterm_stops_bot_and_saves_cursor(self, tmp_path):
+        db = tmp_path / 'state.sqlite3'
+        with FakePracticumAPI({'token': []}) as practicum:
+            process = subprocess.Popen(
+                [sys.executable, 'homework.py'],
+                cwd=startup.ROOT,
+                env={
+                    **os.environ,
+                    'PRACTICUM_TOKEN': 'token',
+                    'TELEGRAM_TOKEN': '1234:abcdefg',
+                    'TELEGRAM_CHAT_ID': '1',
+                    'ENDPOINT': practicum.endpoint,
+                    'STATE_DB': str(db),
+                    'DELIVERY_QUEUE': '1',
+                },
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+            )
+            deadline = time.monotonic() + 10
+            while practicum.requests == 0 and time.monotonic() < deadline:
+                time.sleep(0.05)
+            process.send_signal(signal.SIGTERM)
+            output = process.communicate(timeout=10)[0].decode()
+        assert process.returncode == 0, output
+        assert 'Бот остановлен' in output
+        with sqlite3.connect(db) as connection:
+            assert connection.execute(
+                'SELECT COUNT(*) FROM cursors'
+            ).fetchone() == (1,)
+
+    def test_sigterm_reaches_supervised_shards(self, tmp_path):
+        with FakePracticumAPI(
+            {'t1': [], 't2': [], 't3': []}
+        ) as practicum:
+            process = subprocess.Popen(
+                [sys.executable, 'homework.py'],
+                cwd=startup.ROOT,
+                env={
+                    **os.environ,
+                    'SUBSCRIPTIONS': '{"t1": ["1"], "t2": ["2"], "t3": ["3"]}',
+                    'TELEGRAM_TOKEN': '1234:abcdefg',
+                    'ENDPOINT': practicum.endpoint,
+                    'STATE_DB': str(tmp_path / 'state.sqlite3'),
+                    'SHARD_WORKERS': '2',
+                },
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+            )
+            deadline = time.monotonic() + 20
+            while practicum.requests < 3 and time.monotonic() < deadline:
+                time.sleep(0.05)
+            process.send_signal(signal.SIGTERM)
+            output = process.communicate(timeout=30)[0].decode()
+        assert process.returncode == 0, output
+        assert output.count('Бот остановлен') == 2, (
+            'Каждый шард должен корректно остановиться по сигналу '
+            'супервизору.'
+        )
+        assert 'перезапускаем' not in output
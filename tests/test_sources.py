@@ -0,0 +1,140 @@
+import json
+import urllib.error
+import urllib.request
+
+from scheduler import PollScheduler
+from sources import PollingSource, WebhookSource
+from subscriptions import PollState, Subscription
+
+SUBSCRIPTION = Subscription('token', ('1',))
+PAYLOAD = {
+    'homeworks': [{'homework_name': 'hw', 'status': 'approved'}],
+    'current_date': 1000,
+}
+
+
+class TestWebhookSource:
+
+    def make_source(self, secret=None):
+        received = []
+
+        def handler(subscription, response):
+            response['homeworks']
+            received.append((subscription, response))
+
+        source = WebhookSource(
+            '127.0.0.1', 0, [SUBSCRIPTION], handler, secret
+        )
+        return source, received
+
+    def test_push_is_routed_to_subscription(self):
+        source, received = self.make_source()
+        status = source.receive(
+            {'Authorization': 'OAuth token'}, json.dumps(PAYLOAD).encode()
+        )
+        assert status == 204
+        assert received == [(SUBSCRIPTION, PAYLOAD)]
+
+    def test_unknown_token_is_rejected(self):
+        source, received = self.make_source()
+        status = source.receive({'Authorization': 'OAuth other'}, b'{}')
+        assert status == 401
+        assert received == [], (
+            'Push-запрос с чужим токеном не должен обрабатываться.'
+        )
+
+    def test_secret_is_checked(self):
+        source, received = self.make_source(secret='s3cret')
+        body = json.dumps(PAYLOAD).encode()
+        headers = {'Authorization': 'OAuth token'}
+        assert source.receive(headers, body) == 401
+        headers['X-Webhook-Secret'] = 's3cret'
+        assert source.receive(headers, body) == 204
+
+    def test_invalid_payload_is_bad_request(self):
+        source, received = self.make_source()
+        headers = {'Authorization': 'OAuth token'}
+        assert source.receive(headers, b'not json') == 400
+        assert source.receive(headers, b'{}') == 400
+
+    def test_http_endpoint(self):
+        source, received = self.make_source()
+        source.start()
+        try:
+            host, port = source.server.server_address
+            request = urllib.request.Request(
+                f'http://{host}:{port}/',
+                data=json.dumps(PAYLOAD).encode(),
+                headers={'Authorization': 'OAuth token'},
+            )
+            with urllib.request.urlopen(request, timeout=2) as response:
+                assert response.status == 204
+        finally:
+            source.stop()
+        assert received == [(SUBSCRIPTION, PAYLOAD)]
+
+
+class TestWebhookHandling:
+
+    def test_push_notifies_like_poll(self, monkeypatch):
+        import homework
+
+        sent = []
+        monkeypatch.setattr(
+            homework, 'send_to_chat',
+            lambda bot, chat_id, message: sent.append((chat_id, message)),
+        )
+        states = {SUBSCRIPTION.key: homework.PollState(0)}
+        source = homework.webhook_source(None, [SUBSCRIPTION], states)
+        for _ in range(2):
+            source.receive(
+                {'Authorization': 'OAuth token'},
+                json.dumps(PAYLOAD).encode(),
+            )
+        assert sent == [('1', homework.parse_status(PAYLOAD['homeworks'][0]))]
+        assert states[SUBSCRIPTION.key].from_date == 1000, (
+            'Push-запрос должен сдвигать from_date так же, как опрос.'
+        )
+
+
+class TestPollingSource:
+
+    def test_round_polls_due_subscriptions(self):
+        polled = []
+        states = {SUBSCRIPTION.key: PollState(0)}
+        source = PollingSource(
+            [SUBSCRIPTION], states, PollScheduler(600), polled.append
+        )
+        source.start()
+        assert source.run_round() == 600
+        assert polled == [[SUBSCRIPTION]]
+        source.stop()
+
+
+class TestSourceConfig:
+
+    def test_unknown_source_is_rejected(self, monkeypatch, homework_module):
+        monkeypatch.setattr(homework_module, 'PRACTICUM_TOKEN', 'token')
+        monkeypatch.setattr(homework_module, 'TELEGRAM_TOKEN', '1:a')
+        monkeypatch.setattr(homework_module, 'TELEGRAM_CHAT_ID', '1')
+        assert homework_module.check_config()
+        monkeypatch.setattr(homework_module, 'STATUS_SOURCE', 'pol')
+        assert not homework_module.check_config(), (
+            'Опечатка в STATUS_SOURCE не должна молча включать опрос.'
+        )
+
+    def test_webhook_only_does_not_poll(self, monkeypatch, homework_module):
+        monkeypatch.setattr(homework_module, 'STATUS_SOURCE', 'webhook')
+        monkeypatch.setattr(homework_module, 'WEBHOOK_PORT', 0)
+        states = {SUBSCRIPTION.key: homework_module.PollState(0)}
+        sources = homework_module.start_sources(
+            None, [SUBSCRIPTION], states, PollScheduler(600)
+        )
+        try:
+            assert [source.name for source in sources] == ['webhook']
+            assert homework_module.run_sources(sources) == (
+                homework_module.RETRY_PERIOD
+            )
+        finally:
+            for source in sources:
+                source.stop()
@@ -0,0 +1,39 @@
+import os
+import subprocess
+import sys
+
+from benchmarks import startup
+
+
+class TestStartup:
+    ENV = {
+        'PRACTICUM_TOKEN': 'sometoken',
+        'TELEGRAM_TOKEN': '1234:abcdefg',
+        'TELEGRAM_CHAT_ID': '12345',
+    }
+
+    def run_check(self, env):
+        clean_env = {
+            key: value for key, value in os.environ.items()
+            if key not in self.ENV
+        }
+        return subprocess.run(
+            [sys.executable, 'homework.py', '--check'],
+            cwd=startup.ROOT, env={**clean_env, **env},
+            capture_output=True, check=False
+        )
+
+    def test_import_does_not_load_heavy_modules(self):
+        assert startup.loaded_heavy_modules(dict(os.environ)) == [], (
+            'Импорт homework не должен загружать telegram и requests.'
+        )
+
+    def test_check_with_valid_config(self):
+        assert self.run_check(self.ENV).returncode == 0
+
+    def test_check_without_tokens(self):
+        assert self.run_check({}).returncode == 1
+
+    def test_check_with_broken_subscriptions(self):
+        result = self.run_check({**self.ENV, 'SUBSCRIPTIONS': '[broken'})
+        assert result.returncode == 1
@@ -0,0 +1,47 @@
+import sqlite3
+
+from state import StateStore
+
+
+class TestStateStore:
+
+    def test_cursors_survive_reopen(self, tmp_path):
+        path = str(tmp_path / 'state.sqlite3')
+        store = StateStore(path)
+        store.save_cursors({'sub1': 100, 'sub2': 200})
+        store.save_cursors({'sub1': 150})
+        store.close()
+
+        store = StateStore(path)
+        assert store.load_cursors() == {'sub1': 150, 'sub2': 200}, (
+            'Курсоры опроса должны сохраняться между запусками.'
+        )
+        store.close()
+
+    def test_statuses_are_keyed_by_subscription(self, tmp_path):
+        store = StateStore(str(tmp_path / 'state.sqlite3'))
+        store.save_status('sub1', '1', 'reviewing', '2022-01-01T00:00:00Z')
+        store.save_status('sub1', '1', 'approved', '2022-01-02T00:00:00Z')
+        store.save_status('sub2', '1', 'rejected', None)
+        assert store.load_statuses('sub1') == {
+            '1': ('approved', '2022-01-02T00:00:00Z')
+        }
+        assert store.load_statuses('sub2') == {'1': ('rejected', None)}
+        assert store.load_statuses('unknown') == {}
+        store.close()
+
+    def test_old_digests_table_is_migrated(self, tmp_path):
+        path = str(tmp_path / 'state.sqlite3')
+        with sqlite3.connect(path) as connection:
+            connection.execute(
+                'CREATE TABLE digests (chat_id TEXT NOT NULL, '
+                'created_at REAL NOT NULL, message TEXT NOT NULL)'
+            )
+            connection.execute("INSERT INTO digests VALUES ('1', 1, 'old')")
+        connection.close()
+        store = StateStore(path)
+        store.add_digest('a', '1', 2, 'new')
+        assert [row[1:] for row in store.load_digests()] == [
+            ('', '1', 1.0, 'old'), ('a', '1', 2.0, 'new')
+        ]
+        store.close()
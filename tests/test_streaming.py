@@ -0,0 +1,166 @@
+import json
+import tracemalloc
+
+import pytest
+
+from benchmarks.simulator import FakePracticumAPI
+from client import PracticumClient
+from exceptions import (
+    InvalidHomeworksError,
+    KeyIsMissingError,
+    ResponseIsNotDictError,
+    ValueIsNotListError,
+)
+from schema import Homework, validate_stream
+from streaming import ResponseStream
+
+STATUSES = ('approved', 'reviewing', 'rejected')
+
+
+def chunked(body, size):
+    data = body.encode()
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+
+class TestResponseStream:
+
+    @pytest.mark.parametrize('size', [1, 7, 4096])
+    def test_stream_matches_json(self, size):
+        response = {
+            'current_date': 1581604970,
+            'homeworks': [
+                {'homework_name': 'Проект «Бот»', 'status': 'approved'},
+                {'homework_name': 'hw2', 'status': 'rejected', 'id': 12},
+            ],
+            'extra': {'nested': [1, 2.5, None]},
+        }
+        stream = ResponseStream(chunked(json.dumps(response), size))
+        assert list(stream.homeworks()) == response['homeworks']
+        assert stream.fields == {
+            'current_date': 1581604970, 'extra': {'nested': [1, 2.5, None]}
+        }
+        assert stream.items == 2
+
+    def test_not_an_object(self):
+        stream = ResponseStream(chunked('[1, 2]', 2))
+        with pytest.raises(ResponseIsNotDictError):
+            list(stream.homeworks())
+
+    def test_truncated_body(self):
+        stream = ResponseStream(chunked('{"homeworks": [{"a": 1}', 3))
+        with pytest.raises(ValueError):
+            list(stream.homeworks())
+
+    def test_memory_stays_flat(self):
+        item = json.dumps({
+            'id': 1, 'homework_name': 'hw' * 50, 'status': 'approved'
+        })
+
+        def body(count):
+            yield b'{"homeworks": ['
+            for i in range(count):
+                yield (item + (',' if i < count - 1 else '')).encode()
+            yield b'], "current_date": 1}'
+
+        def peak(count):
+            tracemalloc.start()
+            stream = ResponseStream(body(count))
+            for _ in validate_stream(stream, STATUSES):
+                pass
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return peak
+
+        assert peak(20000) < 2 * peak(2000), (
+            'Потоковый разбор не должен расходовать память '
+            'пропорционально размеру ответа.'
+        )
+
+
+class TestValidateStream:
+
+    def test_records_are_yielded(self):
+        stream = ResponseStream(chunked(json.dumps({
+            'homeworks': [{'homework_name': 'hw', 'status': 'approved'}],
+            'current_date': 1,
+        }), 5))
+        assert list(validate_stream(stream, STATUSES)) == [
+            Homework('hw', 'approved')
+        ]
+
+    @pytest.mark.parametrize('response, error', [
+        ({'homeworks': {}, 'current_date': 1}, ValueIsNotListError),
+        ({'current_date': 1}, KeyIsMissingError),
+        ({'homeworks': []}, KeyIsMissingError),
+    ])
+    def test_invalid_response(self, response, error):
+        stream = ResponseStream(chunked(json.dumps(response), 5))
+        with pytest.raises(error):
+            list(validate_stream(stream, STATUSES))
+
+    def test_invalid_item_is_skipped(self):
+        stream = ResponseStream(chunked(json.dumps({
+            'homeworks': [
+                {'homework_name': 'bad', 'status': 'lost'},
+                {'homework_name': 'hw', 'status': 'approved'},
+            ],
+            'current_date': 1,
+        }), 5))
+        records = []
+        with pytest.raises(InvalidHomeworksError) as info:
+            for homework in validate_stream(stream, STATUSES):
+                records.append(homework)
+        assert records == [Homework('hw', 'approved')]
+        assert len(info.value.errors) == 1
+
+
+class TestStreamingPoll:
+
+    def test_poll_with_streaming(self, monkeypatch):
+        import homework
+        from subscriptions import Subscription
+
+        sent = []
+        monkeypatch.setattr(
+            homework, 'send_to_chat',
+            lambda bot, chat_id, message: sent.append(message),
+        )
+        monkeypatch.setattr(homework, 'STREAM_RESPONSES', True)
+        with FakePracticumAPI({'token': [(0, 'approved')]}) as practicum:
+            monkeypatch.setattr(
+                homework, '_client', PracticumClient(practicum.endpoint)
+            )
+            state = homework.PollState(0)
+            homework.poll_subscription(
+                None, Subscription('token', ('1',)), state
+            )
+        assert sent == [
+            'Изменился статус проверки работы "hw-token". '
+            + homework.HOMEWORK_VERDICTS['approved']
+        ]
+        assert state.from_date > 0
+        assert state.error is None
+
+    def test_invalid_stream_is_not_half_processed(self, monkeypatch):
+        import homework
+        from subscriptions import Subscription
+
+        sent = []
+        monkeypatch.setattr(
+            homework, 'send_to_chat',
+            lambda bot, chat_id, message: sent.append(message),
+        )
+        subscription = Subscription('token', ('1',))
+        state = homework.PollState(0)
+        stream = ResponseStream(chunked(json.dumps({
+            'homeworks': [
+                {'id': 1, 'homework_name': 'hw', 'status': 'approved'}
+            ],
+        }), 5))
+        with pytest.raises(KeyIsMissingError):
+            homework.handle_response(None, subscription, state, stream)
+        assert sent == [], (
+            'Работы из ответа без current_date не должны отправляться.'
+        )
+        assert state.statuses == {}
+        assert homework.get_store().load_statuses(subscription.key) == {}
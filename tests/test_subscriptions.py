@@ -0,0 +1,43 @@
+import pytest
+
+from messages import ChatPreference
+from subscriptions import Subscription, load_subscriptions, parse_subscriptions
+
+
+class TestSubscriptions:
+
+    def test_parse_subscriptions(self):
+        subscriptions = parse_subscriptions(
+            '{"token1": ["1", 2], "token2": 3}'
+        )
+        assert subscriptions == [
+            Subscription('token1', ('1', '2')),
+            Subscription('token2', ('3',)),
+        ]
+
+    def test_parse_invalid_subscriptions(self):
+        with pytest.raises(TypeError):
+            parse_subscriptions('["token1"]')
+
+    def test_load_from_file(self, tmp_path):
+        path = tmp_path / 'subscriptions.json'
+        path.write_text('{"token1": "1"}', encoding='utf-8')
+        assert load_subscriptions(str(path), None) == [
+            Subscription('token1', ('1',))
+        ]
+        assert load_subscriptions(None, None) == []
+
+    def test_key_hides_token(self):
+        subscription = Subscription('secret-token', ('1',))
+        assert 'secret' not in subscription.key
+        assert subscription.headers == {
+            'Authorization': 'OAuth secret-token'
+        }
+
+    def test_chat_preferences(self):
+        subscription, = parse_subscriptions(
+            '{"token1": ["1", {"id": 2, "locale": "en", "verbosity": "full"}]}'
+        )
+        assert subscription.chat_ids == ('1', '2')
+        assert subscription.preference('1') == ChatPreference()
+        assert subscription.preference('2') == ChatPreference('en', 'full')
@@ -81,6 +81,8 @@ class MockResponseGET:
         self.status_code = http_status
         self.reason = ''
         self.text = ''
+        self.content = b''
+        self.headers = {}
         logging.warn(MockResponseGET.CALLED_LOG_MSG)
 
     def json(self):